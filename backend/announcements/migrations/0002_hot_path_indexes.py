@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    
+    dependencies = [
+        ('announcements', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+    
+    operations = [
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-publish_date', 'audience'], name='announcement_published_idx'),
+        ),
+    ]
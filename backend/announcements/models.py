@@ -44,6 +44,14 @@ class Announcement(models.Model):
     
     class Meta:
         ordering = ['-publish_date']
+        indexes = [
+            # Published announcements for an audience, newest first
+            models.Index(
+                fields=['-publish_date', 'audience'],
+                name='announcement_published_idx',
+                condition=models.Q(is_published=True),
+            ),
+        ]
     
     def __str__(self):
         return self.title
\ No newline at end of file
@@ -1,5 +1,6 @@
 from rest_framework import generics, permissions
 from django.utils import timezone
+from school_system.conditional import conditional_get
 from .models import Announcement
 from .serializers import (
     AnnouncementSerializer,
@@ -14,11 +15,20 @@ class IsAdminUser(permissions.BasePermission):
 
 class AnnouncementListView(generics.ListAPIView):
     """
-    List announcements based on user role
+    List announcements based on user role.
+    Supports conditional requests (ETag / If-None-Match).
     """
     serializer_class = AnnouncementListSerializer
     permission_classes = [permissions.IsAuthenticated]
     
+    def get_validators(self, request, *args, **kwargs):
+        # The ids in the set change when an announcement is published or expires
+        return [self.get_queryset()]
+    
+    @conditional_get
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+    
     def get_queryset(self):
         user = self.request.user
         now = timezone.now()
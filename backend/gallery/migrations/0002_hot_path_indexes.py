@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    
+    dependencies = [
+        ('gallery', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+    
+    operations = [
+        migrations.AddIndex(
+            model_name='galleryimage',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-event_date', '-created_at'], name='gallery_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='galleryimage',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['category', '-event_date', '-created_at'], name='gallery_published_category_idx'),
+        ),
+    ]
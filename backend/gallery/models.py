@@ -48,6 +48,19 @@ class GalleryImage(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Public gallery, optionally by category, newest event first
+            models.Index(
+                fields=['-event_date', '-created_at'],
+                name='gallery_published_idx',
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=['category', '-event_date', '-created_at'],
+                name='gallery_published_category_idx',
+                condition=models.Q(is_published=True),
+            ),
+        ]
     
     def __str__(self):
         return self.title
\ No newline at end of file
@@ -1,11 +1,21 @@
 from django.contrib import admin
-from .models import Term, Result, Attendance, Fee
+from .models import Term, GradingScale, GradeBand, Result, Attendance, Fee
 
 @admin.register(Term)
 class TermAdmin(admin.ModelAdmin):
     list_display = ['__str__', 'start_date', 'end_date', 'is_current']
     list_filter = ['academic_year', 'is_current']
 
+class GradeBandInline(admin.TabularInline):
+    model = GradeBand
+    extra = 0
+
+@admin.register(GradingScale)
+class GradingScaleAdmin(admin.ModelAdmin):
+    list_display = ['name', 'academic_year', 'grade_level', 'updated_at']
+    list_filter = ['academic_year', 'grade_level']
+    inlines = [GradeBandInline]
+
 @admin.register(Result)
 class ResultAdmin(admin.ModelAdmin):
     list_display = ['student', 'subject', 'term', 'marks_obtained', 'grade']
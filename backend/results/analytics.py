@@ -0,0 +1,159 @@
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from classes.models import Class, Subject
+from .models import Result
+
+PERCENTILES = [10, 25, 50, 75, 90]
+
+
+def _cache_key(term_id):
+    return f"results:statistics:{term_id}"
+
+
+def _load_term_marks(term_id, chunk_size=5000):
+    """
+    Stream a term's results into column arrays:
+    class ids (0 for students without a class), subject ids, percentages and grades
+    """
+    rows = (
+        Result.objects.filter(term_id=term_id)
+        .order_by()
+        .values_list('student__current_class_id', 'subject_id', 'marks_obtained', 'total_marks', 'grade')
+        .iterator(chunk_size=chunk_size)
+    )
+    
+    class_ids, subject_ids, percentages, grades = [], [], [], []
+    for class_id, subject_id, marks_obtained, total_marks, grade in rows:
+        class_ids.append(class_id or 0)
+        subject_ids.append(subject_id)
+        percentages.append(float(marks_obtained) * 100 / float(total_marks))
+        grades.append(grade or '')
+    
+    return (
+        np.asarray(class_ids, dtype=np.int64),
+        np.asarray(subject_ids, dtype=np.int64),
+        np.asarray(percentages, dtype=float),
+        np.asarray(grades, dtype=object),
+    )
+
+
+def _group_statistics(group_keys, percentages, grades, pass_percentage):
+    """
+    Statistics for every group of rows sharing the same key, computed in
+    vectorized passes over the rows sorted by (key, percentage).
+    Returns (keys of each group, list of statistics dicts).
+    """
+    order = np.lexsort((percentages, group_keys))
+    keys = group_keys[order]
+    values = percentages[order]
+    grades = grades[order]
+    
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    counts = np.diff(np.r_[starts, len(values)])
+    
+    sums = np.add.reduceat(values, starts)
+    means = sums / counts
+    squares = np.add.reduceat(values ** 2, starts)
+    stds = np.sqrt(np.maximum(squares / counts - means ** 2, 0))
+    passed = np.add.reduceat((values >= pass_percentage).astype(np.int64), starts)
+    minimums = values[starts]
+    maximums = values[starts + counts - 1]
+    
+    # Linear interpolation between the closest ranks, like numpy.percentile
+    percentiles = {}
+    for percentile in PERCENTILES:
+        position = (counts - 1) * percentile / 100
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        below = values[starts + lower]
+        above = values[starts + upper]
+        percentiles[percentile] = below + (above - below) * (position - lower)
+    
+    # Grade histogram: one row per group, one column per grade
+    group_numbers = np.repeat(np.arange(len(starts)), counts)
+    grade_names, grade_codes = np.unique(grades.astype(str), return_inverse=True)
+    histogram = np.zeros((len(starts), len(grade_names)), dtype=np.int64)
+    np.add.at(histogram, (group_numbers, grade_codes), 1)
+    
+    statistics = []
+    for group in range(len(starts)):
+        statistics.append({
+            'count': int(counts[group]),
+            'mean': round(float(means[group]), 2),
+            'median': round(float(percentiles[50][group]), 2),
+            'std_dev': round(float(stds[group]), 2),
+            'min': round(float(minimums[group]), 2),
+            'max': round(float(maximums[group]), 2),
+            'pass_rate': round(float(passed[group]) / int(counts[group]) * 100, 2),
+            'percentiles': {str(percentile): round(float(percentiles[percentile][group]), 2) for percentile in PERCENTILES},
+            'grade_distribution': {
+                str(name): int(histogram[group, code])
+                for code, name in enumerate(grade_names)
+                if name and histogram[group, code]
+            },
+        })
+    
+    return keys[starts], statistics
+
+
+def compute_term_statistics(term_id):
+    """
+    Mean, median, standard deviation, pass rate, percentiles and grade
+    distribution of percentages for every (class, subject) of a term, and
+    for every subject across the whole term
+    """
+    class_ids, subject_ids, percentages, grades = _load_term_marks(term_id)
+    pass_percentage = settings.RESULT_PASS_PERCENTAGE
+    
+    statistics = {
+        'term_id': term_id,
+        'pass_percentage': pass_percentage,
+        'generated_at': timezone.now().isoformat(),
+        'classes': [],
+        'subjects': [],
+    }
+    if not len(percentages):
+        return statistics
+    
+    subject_names = dict(Subject.objects.filter(id__in=np.unique(subject_ids).tolist()).values_list('id', 'name'))
+    class_names = dict(Class.objects.filter(id__in=np.unique(class_ids).tolist()).values_list('id', 'name'))
+    
+    # One combined key per (class, subject) pair
+    subject_count = int(subject_ids.max()) + 1
+    pair_keys, pair_statistics = _group_statistics(class_ids * subject_count + subject_ids, percentages, grades, pass_percentage)
+    for key, entry in zip(pair_keys.tolist(), pair_statistics):
+        class_id, subject_id = divmod(key, subject_count)
+        if class_id:
+            statistics['classes'].append({
+                'class_id': class_id,
+                'class_name': class_names.get(class_id),
+                'subject_id': subject_id,
+                'subject_name': subject_names.get(subject_id),
+                **entry,
+            })
+    
+    subject_keys, subject_statistics = _group_statistics(subject_ids, percentages, grades, pass_percentage)
+    for subject_id, entry in zip(subject_keys.tolist(), subject_statistics):
+        statistics['subjects'].append({
+            'subject_id': subject_id,
+            'subject_name': subject_names.get(subject_id),
+            **entry,
+        })
+    
+    return statistics
+
+
+def get_term_statistics(term_id):
+    """Statistics for a term, cached until a result in the term changes"""
+    key = _cache_key(term_id)
+    statistics = cache.get(key)
+    if statistics is None:
+        statistics = compute_term_statistics(term_id)
+        cache.set(key, statistics)
+    return statistics
+
+
+def invalidate_term_statistics(term_id):
+    cache.delete(_cache_key(term_id))
@@ -0,0 +1,244 @@
+import base64
+from datetime import date, timedelta
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Case, CharField, Q, Sum, Value, When
+from django.db.models.functions import Concat, Substr, TruncMonth
+from django.utils import timezone
+from .models import (
+    Attendance,
+    AttendanceRollup,
+    ClassDailyAttendance,
+    StudentMonthlyAttendance,
+    ClassMonthlyAttendance,
+    PeriodAttendance,
+    month_bounds,
+)
+
+COUNT_FIELDS = list(AttendanceRollup.STATUS_FIELDS.values())
+
+# Two bits per day in the calendar bitmaps
+CALENDAR_CODES = {'P': 0, 'A': 1, 'L': 2, 'E': 3}
+
+
+def _rate(counts):
+    """Share of recorded days the student was in school (present or late), in percent"""
+    total = sum(counts[field] for field in COUNT_FIELDS)
+    return {
+        **{field: counts[field] for field in COUNT_FIELDS},
+        'total_days': total,
+        'attendance_rate': round((counts['present'] + counts['late']) * 100 / total, 2) if total else None,
+    }
+
+
+def _full_months(start, end):
+    """First day of the first and last day of the last whole month between two dates, or None"""
+    first = start if start.day == 1 else month_bounds(start)[1] + timedelta(days=1)
+    last = end if end == month_bounds(end)[1] else month_bounds(end)[0] - timedelta(days=1)
+    return (first, last) if first <= last else None
+
+
+def attendance_rate(owner, owner_id, start, end):
+    """
+    Attendance counts and rate of a student or class ('student' / 'class')
+    between two dates, in total and per month.
+    
+    Whole months are read from the monthly rollups; the partial months at
+    either end come from the daily rows (the class daily rollup, or the
+    student's own attendance rows), so a query costs two grouped reads of
+    O(months) rows however many students and days it covers.
+    """
+    if owner == 'student':
+        monthly = StudentMonthlyAttendance.objects.filter(student_id=owner_id)
+        daily = Attendance.objects.filter(student_id=owner_id)
+        daily_counts = AttendanceRollup.status_counts()
+    else:
+        monthly = ClassMonthlyAttendance.objects.filter(class_obj_id=owner_id)
+        daily = ClassDailyAttendance.objects.filter(class_obj_id=owner_id)
+        daily_counts = {field: Sum(field) for field in COUNT_FIELDS}
+    
+    full_months = _full_months(start, end)
+    if full_months:
+        first, last = full_months
+        rows = list(monthly.filter(month__gte=first, month__lte=last).values('month', *COUNT_FIELDS))
+        edges = Q(date__gte=start, date__lt=first) | Q(date__gt=last, date__lte=end)
+    else:
+        rows = []
+        edges = Q(date__gte=start, date__lte=end)
+    
+    rows += list(
+        daily.filter(edges)
+        .order_by()
+        .values(month=TruncMonth('date'))
+        .annotate(**daily_counts)
+    )
+    rows.sort(key=lambda row: row['month'])
+    
+    totals = {field: sum(row[field] for row in rows) for field in COUNT_FIELDS}
+    return {
+        f"{owner}_id": owner_id,
+        'start': start,
+        'end': end,
+        **_rate(totals),
+        'months': [
+            {'month': row['month'].strftime('%Y-%m'), **_rate(row)}
+            for row in rows
+        ],
+    }
+
+
+def _calendar_key(student_id, month):
+    return f"results:attendance-calendar:{student_id}:{month:%Y-%m}"
+
+
+def encode_month(month, statuses):
+    """
+    A month of attendance as two bits per day (day 1 in the lowest bits of a
+    little-endian 64-bit word, base64 encoded) and a mask with bit d-1 set
+    when day d was recorded, since all four codes are real statuses.
+    """
+    bits = recorded = 0
+    for day, status in statuses.items():
+        bits |= CALENDAR_CODES[status] << (2 * (day - 1))
+        recorded |= 1 << (day - 1)
+    return {
+        'month': month.strftime('%Y-%m'),
+        'days': month_bounds(month)[1].day,
+        'statuses': base64.b64encode(bits.to_bytes(8, 'little')).decode(),
+        'recorded': recorded,
+    }
+
+
+def attendance_calendar(student_id, first_month, last_month):
+    """
+    Encoded months of a student's attendance from first_month to last_month
+    (first days of months). Months are cached until their attendance
+    changes; the missing ones are built with one query.
+    """
+    months = [first_month]
+    while months[-1] < last_month:
+        months.append(month_bounds(months[-1])[1] + timedelta(days=1))
+    
+    cached = cache.get_many([_calendar_key(student_id, month) for month in months])
+    missing = [month for month in months if _calendar_key(student_id, month) not in cached]
+    
+    if missing:
+        statuses = {month: {} for month in missing}
+        rows = Attendance.objects.filter(
+            student_id=student_id,
+            date__gte=missing[0],
+            date__lte=month_bounds(missing[-1])[1],
+        ).values_list('date', 'status')
+        for day, status in rows:
+            month = day.replace(day=1)
+            if month in statuses:
+                statuses[month][day.day] = status
+        
+        built = {_calendar_key(student_id, month): encode_month(month, statuses[month]) for month in missing}
+        cache.set_many(built)
+        cached.update(built)
+    
+    return [cached[_calendar_key(student_id, month)] for month in months]
+
+
+def invalidate_attendance_calendar(pairs):
+    """Forget the cached calendar months of the given (student_id, date) pairs"""
+    cache.delete_many({_calendar_key(student_id, day) for student_id, day in pairs})
+
+
+# Gaps and islands: consecutive records of one status share the difference
+# between the row number over all of a student's records and over the
+# records of that status. Each student's last non-absent day up to
+# ``since`` is found once with a grouped query, then only their records
+# after it are range-scanned, which is enough to place every streak that
+# can reach its n-th day after ``since``.
+ABSENCE_STREAKS_SQL = """
+WITH marked AS (
+    SELECT DISTINCT student_id
+    FROM {table}
+    WHERE date > %s AND date <= %s
+),
+cutoffs AS (
+    SELECT m.student_id, COALESCE(MAX(p.date), %s) AS cutoff
+    FROM marked m
+    LEFT JOIN {table} p ON p.student_id = m.student_id AND p.status <> 'A' AND p.date <= %s
+    GROUP BY m.student_id
+),
+recent AS (
+    SELECT a.student_id, a.date, a.status
+    FROM cutoffs c
+    JOIN {table} a ON a.student_id = c.student_id AND a.date > c.cutoff AND a.date <= %s
+),
+numbered AS (
+    SELECT
+        student_id,
+        date,
+        status,
+        ROW_NUMBER() OVER (PARTITION BY student_id ORDER BY date)
+            - ROW_NUMBER() OVER (PARTITION BY student_id, status ORDER BY date) AS island
+    FROM recent
+),
+streaks AS (
+    SELECT
+        student_id,
+        date,
+        MIN(date) OVER (PARTITION BY student_id, island) AS started,
+        ROW_NUMBER() OVER (PARTITION BY student_id, island ORDER BY date) AS streak_day
+    FROM numbered
+    WHERE status = 'A'
+)
+SELECT student_id, started, date
+FROM streaks
+WHERE streak_day = %s AND date > %s
+ORDER BY student_id, date
+"""
+
+
+def absence_streaks(since, until, days):
+    """
+    (student_id, first day, n-th day) of every run of ``days`` consecutive
+    absent records whose n-th day falls after ``since`` and on or before
+    ``until``. Records are only kept for school days, so consecutive
+    records are consecutive school days. A streak is found once, on the
+    run where it reaches ``days``, however long it goes on afterwards.
+    """
+    sql = ABSENCE_STREAKS_SQL.format(table=connection.ops.quote_name(Attendance._meta.db_table))
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [since, until, date.min, since, until, days, since])
+        return [
+            (student_id, _as_date(started), _as_date(reached))
+            for student_id, started, reached in cursor.fetchall()
+        ]
+
+
+def _as_date(value):
+    """Raw query dates come back as strings on SQLite"""
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def mark_period(class_obj, day, period, statuses, student_ids):
+    """
+    Record one period of a class register: ``statuses`` maps student ids
+    to codes, the other ``student_ids`` are marked present. Missing day
+    rows are inserted unmarked, then the period's character is rewritten
+    in every row with one UPDATE, leaving the other periods untouched.
+    """
+    PeriodAttendance.objects.bulk_create(
+        [PeriodAttendance(student_id=student_id, class_obj=class_obj, date=day) for student_id in student_ids],
+        ignore_conflicts=True,
+    )
+    
+    by_status = {}
+    for student_id, status in statuses.items():
+        by_status.setdefault(status, []).append(student_id)
+    status = Case(
+        *[When(student_id__in=ids, then=Value(code)) for code, ids in by_status.items()],
+        default=Value('P'),
+        output_field=CharField(),
+    )
+    
+    return PeriodAttendance.objects.filter(student_id__in=student_ids, date=day).update(
+        periods=Concat(Substr('periods', 1, period - 1), status, Substr('periods', period + 1), output_field=CharField()),
+        class_obj=class_obj,
+        updated_at=timezone.now(),
+    )
@@ -0,0 +1,116 @@
+import multiprocessing
+import os
+import zipfile
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from uuid import uuid4
+from django.conf import settings
+from django.utils import timezone
+from students.models import Student
+from .models import Result, StudentTermSummary
+from .ranking import get_class_ranks
+from .pdf_generator import build_report_card_context, render_report_card, render_report_cards_merged
+
+BATCH_DIRECTORY = os.path.join('report_cards', 'batches')
+
+
+def report_card_filename(context):
+    """File name used for a single report card inside a batch archive"""
+    return f"Report_Card_{context['student_id']}_{context['academic_year']}_Term{context['term_number']}.pdf"
+
+
+def load_class_report_card_contexts(class_obj, term):
+    """
+    Build report card contexts for every active student in a class.
+    Uses one query each for the students, their results and their summaries.
+    """
+    students = list(
+        Student.objects.filter(current_class=class_obj, is_active=True)
+        .select_related('current_class')
+    )
+    
+    results = (
+        Result.objects.filter(term=term, student__current_class=class_obj, student__is_active=True)
+        .select_related('subject')
+        .order_by('student_id', 'subject__name')
+    )
+    
+    results_by_student = defaultdict(list)
+    for result in results:
+        results_by_student[result.student_id].append(result)
+    
+    summaries = {
+        summary.student_id: summary
+        for summary in StudentTermSummary.objects.filter(
+            term=term, student__current_class=class_obj, student__is_active=True
+        )
+    }
+    
+    ranks = get_class_ranks(class_obj.id, term.id)
+    
+    return [
+        build_report_card_context(student, term, results_by_student[student.id], summaries.get(student.id), ranks)
+        for student in students
+    ]
+
+
+def _render_pool(workers):
+    """
+    Return a process pool for rendering, or None to render in-process.
+    Daemonic processes (e.g. Celery's prefork children) cannot fork a pool.
+    """
+    if workers <= 1 or multiprocessing.current_process().daemon:
+        return None
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def generate_report_card_batch(term, classes, output='zip', progress=None):
+    """
+    Render report cards for every active student in the given classes.
+    
+    Cards are written into a single ZIP (rendered across a process pool) or
+    a single merged PDF under MEDIA_ROOT. ``progress`` is called as
+    ``progress(class_obj, done, total)`` while each class is processed.
+    Returns the path of the generated file relative to MEDIA_ROOT. The
+    file name ends in a random token: MEDIA is public, so only the user
+    who queued the batch (and gets the link) can find it.
+    """
+    classes = list(classes)
+    timestamp = timezone.now().strftime('%Y%m%d%H%M%S')
+    scope = f"class{classes[0].id}" if len(classes) == 1 else 'all'
+    extension = 'zip' if output == 'zip' else 'pdf'
+    relative_path = os.path.join(
+        BATCH_DIRECTORY,
+        f"Report_Cards_{term.academic_year.year}_Term{term.term_number}_{scope}_{timestamp}_{uuid4().hex}.{extension}"
+    )
+    absolute_path = os.path.join(settings.MEDIA_ROOT, relative_path)
+    os.makedirs(os.path.dirname(absolute_path), exist_ok=True)
+    
+    if output == 'zip':
+        pool = _render_pool(settings.REPORT_CARD_WORKERS)
+        try:
+            with zipfile.ZipFile(absolute_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+                for class_obj in classes:
+                    contexts = load_class_report_card_contexts(class_obj, term)
+                    total = len(contexts)
+                    rendered = pool.map(render_report_card, contexts, chunksize=4) if pool else map(render_report_card, contexts)
+                    
+                    for done, (context, pdf) in enumerate(zip(contexts, rendered), start=1):
+                        archive.writestr(os.path.join(class_obj.name, report_card_filename(context)), pdf)
+                        if progress:
+                            progress(class_obj, done, total)
+        finally:
+            if pool:
+                pool.shutdown()
+    else:
+        contexts = []
+        for class_obj in classes:
+            class_contexts = load_class_report_card_contexts(class_obj, term)
+            contexts.extend(class_contexts)
+            if progress:
+                progress(class_obj, len(class_contexts), len(class_contexts))
+        
+        with open(absolute_path, 'wb') as merged:
+            render_report_cards_merged(contexts, merged)
+    
+    return relative_path
@@ -0,0 +1,77 @@
+from .models import Result, Attendance
+from .signals import results_changed, attendance_changed
+
+# Columns rewritten when an incoming result hits an existing (student, subject, term)
+RESULT_UPSERT_FIELDS = ['marks_obtained', 'total_marks', 'grade', 'remarks', 'entered_by', 'updated_at']
+
+# Columns rewritten when a roll call hits an existing (student, date); remarks are kept
+ATTENDANCE_UPSERT_FIELDS = ['class_obj', 'status', 'marked_by', 'updated_at']
+
+
+def build_result(student_id, subject_id, term_id, marks_obtained, total_marks, scale, remarks=None, entered_by=None):
+    """An unsaved Result graded on the given compiled grading scale"""
+    result = Result(
+        student_id=student_id,
+        subject_id=subject_id,
+        term_id=term_id,
+        marks_obtained=marks_obtained,
+        total_marks=total_marks,
+        remarks=remarks,
+        entered_by=entered_by,
+    )
+    result.grade = result.calculate_grade(scale)
+    return result
+
+
+def upsert_results(results, batch_size=1000):
+    """
+    Insert or update results on the (student, subject, term) key in one
+    statement per batch, then refresh the data derived from them.
+    Returns the results that are new or whose marks changed, the ones
+    parents need to hear about.
+    """
+    previous = {
+        (student_id, subject_id, term_id): (marks_obtained, total_marks)
+        for student_id, subject_id, term_id, marks_obtained, total_marks in Result.objects.filter(
+            student_id__in={result.student_id for result in results},
+            subject_id__in={result.subject_id for result in results},
+            term_id__in={result.term_id for result in results},
+        ).values_list('student_id', 'subject_id', 'term_id', 'marks_obtained', 'total_marks')
+    }
+    changed = [
+        result for result in results
+        if previous.get((result.student_id, result.subject_id, result.term_id)) != (result.marks_obtained, result.total_marks)
+    ]
+    
+    Result.objects.bulk_create(
+        results,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=['student', 'subject', 'term'],
+        update_fields=RESULT_UPSERT_FIELDS,
+    )
+    results_changed((result.student_id, result.term_id) for result in results)
+    return changed
+
+
+def upsert_attendance(records, batch_size=1000):
+    """
+    Insert or update attendance on the (student, date) key in one
+    statement per batch, then recount the rollups of the days written.
+    """
+    # Records moving to another class leave stale rollups behind in the old one
+    previous = Attendance.objects.filter(
+        student_id__in=[record.student_id for record in records],
+        date__in={record.date for record in records},
+    ).values_list('student_id', 'class_obj_id', 'date')
+    changed = set(previous)
+    
+    Attendance.objects.bulk_create(
+        records,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=['student', 'date'],
+        update_fields=ATTENDANCE_UPSERT_FIELDS,
+    )
+    attendance_changed(changed | {(record.student_id, record.class_obj_id, record.date) for record in records})
+    return len(records)
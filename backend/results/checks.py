@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+
+@register()
+def check_periods_per_day(app_configs, **kwargs):
+    """PERIODS_PER_DAY must fit in the PeriodAttendance.periods column"""
+    from .models import PeriodAttendance
+    
+    if not 1 <= settings.PERIODS_PER_DAY <= PeriodAttendance.MAX_PERIODS:
+        return [Error(
+            f"PERIODS_PER_DAY is {settings.PERIODS_PER_DAY}, it must be between 1 and {PeriodAttendance.MAX_PERIODS}.",
+            hint='Raise PeriodAttendance.MAX_PERIODS (and migrate the periods column) for longer school days.',
+            id='results.E001',
+        )]
+    return []
@@ -0,0 +1,104 @@
+import numpy as np
+from classes.models import ClassSubject
+from students.models import Student
+from .grading import get_grading_scale
+from .models import Result
+
+
+def _to_list(array, decimals=2):
+    """A float array as nested JSON-ready lists, with None for missing values"""
+    rounded = np.round(array, decimals).astype(object)
+    rounded[np.isnan(array)] = None
+    return rounded.tolist()
+
+
+def build_gradebook(class_obj, term):
+    """
+    The students x subjects grid of a class for a term, in columnar form.
+    
+    Students, subjects and results are read with one query each; the result
+    rows are scattered into dense NumPy matrices (NaN where no result was
+    entered), and row totals, column averages and overall grades are
+    computed on whole arrays.
+    """
+    students = list(
+        Student.objects.filter(current_class=class_obj, is_active=True)
+        .order_by('last_name', 'first_name')
+        .values_list('id', 'student_id', 'first_name', 'last_name')
+    )
+    subjects = list(
+        ClassSubject.objects.filter(class_obj=class_obj)
+        .order_by('subject__name')
+        .values_list('subject_id', 'subject__code', 'subject__name')
+    )
+    rows = list(
+        Result.objects.filter(term=term, student__current_class=class_obj, student__is_active=True)
+        .order_by()
+        .values_list('student_id', 'subject_id', 'marks_obtained', 'total_marks', 'grade')
+    )
+    
+    student_index = {student_id: index for index, (student_id, *_) in enumerate(students)}
+    subject_index = {subject_id: index for index, (subject_id, *_) in enumerate(subjects)}
+    
+    shape = (len(students), len(subjects))
+    obtained = np.full(shape, np.nan)
+    possible = np.full(shape, np.nan)
+    grades = np.full(shape, None, dtype=object)
+    
+    # Results for subjects no longer assigned to the class are left out of the grid
+    rows = [row for row in rows if row[1] in subject_index]
+    if rows:
+        student_ids, subject_ids, marks, totals, row_grades = zip(*rows)
+        row_positions = np.fromiter((student_index[student_id] for student_id in student_ids), dtype=np.intp, count=len(rows))
+        column_positions = np.fromiter((subject_index[subject_id] for subject_id in subject_ids), dtype=np.intp, count=len(rows))
+        obtained[row_positions, column_positions] = np.asarray(marks, dtype=float)
+        possible[row_positions, column_positions] = np.asarray(totals, dtype=float)
+        grades[row_positions, column_positions] = row_grades
+    
+    entered = ~np.isnan(obtained)
+    percentages = obtained * 100 / possible
+    
+    total_obtained = np.where(entered, obtained, 0).sum(axis=1)
+    total_possible = np.where(entered, possible, 0).sum(axis=1)
+    overall = np.divide(total_obtained * 100, total_possible, out=np.full(len(students), np.nan), where=total_possible > 0)
+    
+    entered_per_subject = entered.sum(axis=0)
+    average = np.divide(
+        np.where(entered, percentages, 0).sum(axis=0),
+        entered_per_subject,
+        out=np.full(len(subjects), np.nan),
+        where=entered_per_subject > 0,
+    )
+    
+    scale = get_grading_scale(term.academic_year_id, class_obj.grade_level)
+    overall_grades = scale.grades_for(np.round(overall, 2))
+    
+    return {
+        'class_id': class_obj.id,
+        'class_name': class_obj.name,
+        'term_id': term.id,
+        'term_display': str(term),
+        'students': {
+            'id': [student[0] for student in students],
+            'student_id': [student[1] for student in students],
+            'name': [f"{student[2]} {student[3]}" for student in students],
+        },
+        'subjects': {
+            'id': [subject[0] for subject in subjects],
+            'code': [subject[1] for subject in subjects],
+            'name': [subject[2] for subject in subjects],
+            'average_percentage': _to_list(average),
+            'entered': entered_per_subject.tolist(),
+        },
+        # One row per student, one column per subject
+        'marks_obtained': _to_list(obtained),
+        'total_marks': _to_list(possible),
+        'percentages': _to_list(percentages),
+        'grades': grades.tolist(),
+        'totals': {
+            'marks_obtained': _to_list(np.where(total_possible > 0, total_obtained, np.nan)),
+            'marks_possible': _to_list(np.where(total_possible > 0, total_possible, np.nan)),
+            'percentage': _to_list(overall),
+            'grade': overall_grades,
+        },
+    }
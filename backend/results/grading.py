@@ -0,0 +1,177 @@
+from bisect import bisect_right
+from uuid import uuid4
+from decimal import Decimal
+import numpy as np
+from django.core.cache import cache
+from django.db.models import Case, CharField, Q, Value, When
+from django.db.models.lookups import GreaterThanOrEqual
+
+# Used when no GradingScale applies: (minimum percentage, grade, description)
+DEFAULT_GRADE_BANDS = [
+    (90, 'A+', 'Excellent'),
+    (80, 'A', 'Very Good'),
+    (70, 'B+', 'Good'),
+    (60, 'B', 'Above Average'),
+    (50, 'C', 'Average'),
+    (40, 'D', 'Below Average'),
+    (0, 'F', 'Fail'),
+]
+
+VERSION_KEY = 'results:grading-scale:version'
+
+
+class CompiledGradingScale:
+    """
+    An in-memory grading scale.
+    grade_for() finds a grade with a binary search over the cut-offs and
+    case() builds the equivalent SQL CASE expression for the database.
+    """
+    def __init__(self, bands):
+        bands = sorted(bands, key=lambda band: band[0])
+        self.bands = [(Decimal(str(minimum)), grade, description) for minimum, grade, description in bands]
+        self._thresholds = [minimum for minimum, _, _ in self.bands]
+        self._grades = [grade for _, grade, _ in self.bands]
+        self.lowest_grade = self._grades[0]
+    
+    def grade_for(self, percentage):
+        """Letter grade for a percentage, in O(log n)"""
+        index = bisect_right(self._thresholds, Decimal(str(percentage))) - 1
+        return self._grades[max(index, 0)]
+    
+    def grades_for(self, percentages):
+        """Letter grades for a NumPy array of percentages in one pass, None where NaN"""
+        thresholds = np.array([float(minimum) for minimum in self._thresholds])
+        positions = np.maximum(np.searchsorted(thresholds, percentages, side='right') - 1, 0)
+        grades = np.array(self._grades, dtype=object)[positions]
+        grades[np.isnan(percentages)] = None
+        return grades.tolist()
+    
+    def whens(self, percentage, condition=None):
+        """When() clauses mapping a percentage expression to grades, highest first"""
+        clauses = []
+        for minimum, grade, _ in reversed(self.bands[1:]):
+            test = GreaterThanOrEqual(percentage, Value(minimum))
+            clauses.append(When(condition & Q(test) if condition is not None else test, then=Value(grade)))
+        return clauses
+    
+    def case(self, percentage):
+        """SQL expression grading a percentage expression like grade_for()"""
+        return Case(*self.whens(percentage), default=Value(self.lowest_grade), output_field=CharField())
+    
+    def table_rows(self):
+        """[grade, percentage range, description] rows, highest grade first"""
+        rows = []
+        upper = None
+        for minimum, grade, description in reversed(self.bands):
+            if upper is None:
+                percentage_range = f"{_format_percentage(minimum)}% - 100%"
+            elif minimum == 0:
+                percentage_range = f"Below {_format_percentage(upper)}%"
+            else:
+                # Whole-number cut-offs read as "80% - 89%", others as "79.5% - 89.99%"
+                step = 1 if upper == upper.to_integral_value() else Decimal('0.01')
+                percentage_range = f"{_format_percentage(minimum)}% - {_format_percentage(upper - step)}%"
+            rows.append([grade, percentage_range, description])
+            upper = minimum
+        return rows
+
+
+def _format_percentage(value):
+    if value == value.to_integral_value():
+        return str(value.quantize(Decimal(1)))
+    return f"{value.normalize():f}"
+
+
+def _scale_bands(academic_year_id, grade_level):
+    from .models import GradingScale
+    
+    candidates = GradingScale.objects.filter(
+        Q(academic_year_id=academic_year_id) | Q(academic_year__isnull=True),
+        Q(grade_level=grade_level) | Q(grade_level__isnull=True),
+    ).prefetch_related('bands')
+    
+    # Prefer the most specific scale: year and level, year only, level only, global
+    def specificity(scale):
+        return (scale.academic_year_id is not None, scale.grade_level is not None)
+    
+    for scale in sorted(candidates, key=specificity, reverse=True):
+        bands = [(band.min_percentage, band.grade, band.description) for band in scale.bands.all()]
+        if bands:
+            return bands
+    return DEFAULT_GRADE_BANDS
+
+
+def grading_scale_version():
+    """Changes whenever any grading scale changes"""
+    # A fresh random version whenever the key is missing, so an expired version never reuses old entries
+    return cache.get_or_set(VERSION_KEY, lambda: uuid4().hex)
+
+
+def get_grading_scale(academic_year_id=None, grade_level=None):
+    """
+    The compiled grading scale for an academic year and grade level.
+    Bands are cached until any grading scale changes.
+    """
+    version = grading_scale_version()
+    key = f"results:grading-scale:{version}:{academic_year_id}:{grade_level}"
+    bands = cache.get(key)
+    if bands is None:
+        bands = _scale_bands(academic_year_id, grade_level)
+        cache.set(key, bands)
+    return CompiledGradingScale(bands)
+
+
+def grading_scales_changed():
+    """Forget every cached scale"""
+    cache.set(VERSION_KEY, uuid4().hex)
+
+
+def _scale_keys():
+    """(academic_year_id, grade_level) of every configured scale, most specific first"""
+    from .models import GradingScale
+    
+    version = grading_scale_version()
+    key = f"results:grading-scale:{version}:keys"
+    keys = cache.get(key)
+    if keys is None:
+        keys = sorted(
+            GradingScale.objects.values_list('academic_year_id', 'grade_level'),
+            key=lambda pair: (pair[0] is not None, pair[1] is not None),
+            reverse=True,
+        )
+        cache.set(key, keys)
+    return keys
+
+
+def scale_grade_levels(academic_year_id):
+    """Grade levels with a scale of their own for an academic year"""
+    return sorted({
+        grade_level for year_id, grade_level in _scale_keys()
+        if grade_level is not None and year_id in (None, academic_year_id)
+    })
+
+
+def grade_case(percentage, year_field='term__academic_year_id', level_field='student__current_class__grade_level'):
+    """
+    SQL expression grading a percentage expression with the scale that
+    applies to each row, picked by the row's academic year and grade level
+    the same way get_grading_scale() picks it.
+    """
+    whens = []
+    for academic_year_id, grade_level in _scale_keys():
+        if academic_year_id is None and grade_level is None:
+            continue
+        condition = Q()
+        if academic_year_id is not None:
+            condition &= Q(**{year_field: academic_year_id})
+        if grade_level is not None:
+            condition &= Q(**{level_field: grade_level})
+        
+        scale = get_grading_scale(academic_year_id, grade_level)
+        whens.extend(scale.whens(percentage, condition))
+        whens.append(When(condition, then=Value(scale.lowest_grade)))
+    
+    school_scale = get_grading_scale()
+    if not whens:
+        return school_scale.case(percentage)
+    return Case(*whens, default=school_scale.case(percentage), output_field=CharField())
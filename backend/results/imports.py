@@ -0,0 +1,159 @@
+import csv
+import io
+import os
+from decimal import Decimal, InvalidOperation
+from uuid import uuid4
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from classes.models import Subject
+from students.models import Student
+from .bulk import build_result, upsert_results
+from .grading import get_grading_scale
+from .notifications import notify_parents
+
+IMPORT_DIRECTORY = 'imports/results'
+ERROR_REPORT_DIRECTORY = 'imports/errors'
+
+REQUIRED_COLUMNS = ['student_id', 'subject_code', 'marks_obtained']
+
+
+def iter_rows(fileobj, filename):
+    """
+    Yield each data row of a CSV or XLSX file as a dict keyed by header.
+    Rows are read one at a time so large files never sit in memory.
+    """
+    if filename.lower().endswith('.xlsx'):
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise ValueError('openpyxl is required to import .xlsx files')
+        
+        workbook = load_workbook(fileobj, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(cell).strip() if cell is not None else '' for cell in next(rows, [])]
+            for values in rows:
+                if any(value is not None for value in values):
+                    yield dict(zip(header, values))
+        finally:
+            workbook.close()
+    else:
+        reader = csv.DictReader(io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline=''))
+        for row in reader:
+            yield {key.strip(): value for key, value in row.items() if key}
+
+
+def _decimal(value):
+    if value is None or str(value).strip() == '':
+        return None
+    try:
+        number = Decimal(str(value).strip())
+        # NaN and Infinity parse but cannot be compared or stored
+        if not number.is_finite():
+            raise InvalidOperation
+        return number.quantize(Decimal('0.01'))
+    except InvalidOperation:
+        raise ValueError(f"'{value}' is not a number")
+
+
+def import_results(fileobj, filename, term, batch_size=1000, entered_by=None, progress=None):
+    """
+    Stream results from a CSV/XLSX file and upsert them for a term.
+    
+    Students (by student_id) and subjects (by code) are resolved through
+    lookup maps built once, rows are upserted in fixed-size batches, each
+    in its own transaction, and rejected rows are written to a CSV error
+    report in the default storage, under a name with a random token since
+    it lists student ids. ``progress`` is called as
+    ``progress(rows_read, imported, errors)`` after every batch.
+    """
+    # Results are graded on the scale of the student's class grade level
+    students = {
+        code: (student_id, grade_level)
+        for code, student_id, grade_level in Student.objects.values_list('student_id', 'id', 'current_class__grade_level')
+    }
+    subjects = dict(Subject.objects.values_list('code', 'id'))
+    scales = {}
+    
+    rows_read = 0
+    imported = 0
+    errors = 0
+    batch = {}
+    
+    def flush():
+        nonlocal imported
+        if batch:
+            results = list(batch.values())
+            with transaction.atomic():
+                changed = upsert_results(results)
+            imported += len(results)
+            notify_parents(changed)
+            batch.clear()
+        if progress:
+            progress(rows_read, imported, errors)
+    
+    with io.StringIO(newline='') as report_file:
+        report = csv.writer(report_file)
+        report.writerow(['row', 'student_id', 'subject_code', 'error'])
+        
+        for line, row in enumerate(iter_rows(fileobj, filename), start=2):
+            rows_read += 1
+            student_code = str(row.get('student_id') or '').strip()
+            subject_code = str(row.get('subject_code') or '').strip()
+            
+            try:
+                missing = [column for column in REQUIRED_COLUMNS if row.get(column) in (None, '')]
+                if missing:
+                    raise ValueError(f"Missing {', '.join(missing)}")
+                if student_code not in students:
+                    raise ValueError('Unknown student_id')
+                if subject_code not in subjects:
+                    raise ValueError('Unknown subject_code')
+                
+                marks_obtained = _decimal(row.get('marks_obtained'))
+                total_marks = _decimal(row.get('total_marks')) or Decimal('100')
+                if marks_obtained < 0 or not 0 < total_marks < 1000 or marks_obtained > total_marks:
+                    raise ValueError('Marks must be between 0 and total_marks')
+            except ValueError as error:
+                errors += 1
+                report.writerow([line, student_code, subject_code, str(error)])
+                continue
+            
+            student_id, grade_level = students[student_code]
+            if grade_level not in scales:
+                scales[grade_level] = get_grading_scale(term.academic_year_id, grade_level)
+            
+            result = build_result(
+                student_id,
+                subjects[subject_code],
+                term.id,
+                marks_obtained,
+                total_marks,
+                scales[grade_level],
+                remarks=row.get('remarks') or None,
+                entered_by=entered_by,
+            )
+            # A later row for the same student and subject wins
+            batch[(result.student_id, result.subject_id)] = result
+            
+            if len(batch) >= batch_size:
+                flush()
+        
+        flush()
+        
+        report_path = None
+        if errors:
+            report_path = default_storage.save(
+                f"{ERROR_REPORT_DIRECTORY}/{os.path.splitext(os.path.basename(filename))[0]}"
+                f"_{timezone.now().strftime('%Y%m%d%H%M%S')}_{uuid4().hex}_errors.csv",
+                ContentFile(report_file.getvalue().encode()),
+            )
+    
+    return {
+        'rows': rows_read,
+        'imported': imported,
+        'errors': errors,
+        'error_report': report_path,
+    }
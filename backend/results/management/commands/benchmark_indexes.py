@@ -0,0 +1,241 @@
+import random
+import re
+import time
+from datetime import date, timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+from accounts.models import User
+from announcements.models import Announcement
+from classes.models import AcademicYear, Class, Subject
+from gallery.models import GalleryCategory, GalleryImage
+from students.models import Student
+from results.models import Term, Result, Attendance, Fee
+
+# (model, index name) of the hot path indexes being measured
+BENCHMARKED_INDEXES = [
+    (Result, 'result_student_term_idx'),
+    (Attendance, 'attendance_class_date_idx'),
+    (Fee, 'fee_status_due_date_idx'),
+    (Announcement, 'announcement_published_idx'),
+    (GalleryImage, 'gallery_published_idx'),
+    (GalleryImage, 'gallery_published_category_idx'),
+    (Student, 'student_parent_active_idx'),
+    (Student, 'student_active_name_idx'),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed realistic volumes and compare EXPLAIN ANALYZE timings of the hot queries '
+        'with and without the composite/partial indexes. Everything is rolled back afterwards, but the '
+        'tables stay locked while it runs, so point --database at a scratch database.'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=2000, help='Students to seed')
+        parser.add_argument('--days', type=int, default=120, help='School days of attendance per student')
+        parser.add_argument('--announcements', type=int, default=5000, help='Announcements to seed')
+        parser.add_argument('--images', type=int, default=5000, help='Gallery images to seed')
+        parser.add_argument('--runs', type=int, default=5, help='Timed runs per query (best is kept)')
+        parser.add_argument('--plans', action='store_true', help='Print the query plans')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Database alias to benchmark on')
+        parser.add_argument(
+            '--allow-default-database',
+            action='store_true',
+            help='Run on the default database even when DEBUG is off',
+        )
+    
+    def handle(self, *args, **options):
+        if options['database'] == DEFAULT_DB_ALIAS and not (settings.DEBUG or options['allow_default_database']):
+            raise CommandError(
+                'benchmark_indexes seeds data and drops indexes in one long transaction, locking the tables '
+                'it touches. Run it with --database set to a scratch database, or pass --allow-default-database.'
+            )
+        
+        self.options = options
+        self.database = options['database']
+        self.connection = connections[self.database]
+        self.random = random.Random(42)
+        
+        with transaction.atomic(using=self.database):
+            self.stdout.write('Seeding...')
+            sample = self.seed()
+            queries = self.hot_queries(sample)
+            self.analyze()
+            
+            after = {label: self.measure(label, queryset) for label, queryset in queries}
+            self.drop_indexes()
+            self.analyze()
+            before = {label: self.measure(label, queryset) for label, queryset in queries}
+            
+            transaction.set_rollback(True, using=self.database)
+        
+        unit = 'ms (EXPLAIN ANALYZE)' if self.connection.vendor == 'postgresql' else 'ms (best wall time)'
+        self.stdout.write(f"\n{'Query':<38}{'Before':>12}{'After':>12}{'Speedup':>10}  {unit}")
+        for label, _ in queries:
+            speedup = before[label] / after[label] if after[label] else float('inf')
+            self.stdout.write(f"{label:<38}{before[label]:>12.3f}{after[label]:>12.3f}{speedup:>9.1f}x")
+    
+    def seed(self):
+        options = self.options
+        today = timezone.now().date()
+        
+        academic_year = AcademicYear.objects.using(self.database).create(
+            year='BENCH', start_date=today - timedelta(days=300), end_date=today + timedelta(days=60)
+        )
+        terms = [
+            Term.objects.using(self.database).create(
+                academic_year=academic_year,
+                term_number=str(number),
+                start_date=today - timedelta(days=400 - 100 * number),
+                end_date=today - timedelta(days=300 - 100 * number),
+            )
+            for number in range(1, 4)
+        ]
+        subjects = Subject.objects.using(self.database).bulk_create([
+            Subject(name=f"Bench Subject {index}", code=f"BENCH{index}", grade_level=10)
+            for index in range(8)
+        ])
+        classes = Class.objects.using(self.database).bulk_create([
+            Class(name=f"Bench {index}", grade_level=10, section=str(index), academic_year=academic_year)
+            for index in range(max(options['students'] // 30, 1))
+        ])
+        parents = User.objects.using(self.database).bulk_create([
+            User(username=f"bench_parent_{index}", email=f"bench{index}@school.com", role='PARENT', password='!')
+            for index in range(max(options['students'] * 2 // 3, 1))
+        ])
+        
+        students = Student.objects.using(self.database).bulk_create([
+            Student(
+                parent=self.random.choice(parents),
+                first_name=f"First{index}",
+                last_name=f"Last{self.random.randrange(options['students'])}",
+                student_id=f"BENCH{index:06d}",
+                date_of_birth=date(2010, 1, 1),
+                gender='M',
+                admission_date=date(2020, 1, 1),
+                current_class=classes[index % len(classes)],
+                address='Address',
+                emergency_contact_name='Contact',
+                emergency_contact_phone='0700000000',
+                emergency_contact_relation='Parent',
+                is_active=self.random.random() > 0.1,
+            )
+            for index in range(options['students'])
+        ], batch_size=1000)
+        
+        Result.objects.using(self.database).bulk_create((
+            Result(student=student, subject=subject, term=term, marks_obtained=self.random.randint(0, 100), grade='B')
+            for student in students for subject in subjects for term in terms
+        ), batch_size=2000)
+        
+        school_days = [today - timedelta(days=offset) for offset in range(options['days'])]
+        Attendance.objects.using(self.database).bulk_create((
+            Attendance(student=student, class_obj_id=student.current_class_id, date=day, status=self.random.choice('PPPPPPPALE'))
+            for student in students for day in school_days
+        ), batch_size=5000)
+        
+        # (status, amount paid) pairs that satisfy the fee status constraint
+        payments = [('PAID', 500), ('PAID', 500), ('PAID', 500), ('PENDING', 0), ('PARTIAL', 200), ('OVERDUE', 0)]
+        fees = []
+        for student in students:
+            for term in terms:
+                fee_status, amount_paid = self.random.choice(payments)
+                fees.append(Fee(
+                    student=student,
+                    term=term,
+                    amount=500,
+                    amount_paid=amount_paid,
+                    status=fee_status,
+                    due_date=term.end_date,
+                ))
+        Fee.objects.using(self.database).bulk_create(fees, batch_size=2000)
+        
+        Announcement.objects.using(self.database).bulk_create((
+            Announcement(
+                title=f"Announcement {index}",
+                content='Content',
+                audience=self.random.choice(['ALL', 'PARENTS', 'TEACHERS', 'STUDENTS']),
+                is_published=self.random.random() > 0.2,
+                publish_date=timezone.now() - timedelta(hours=index),
+            )
+            for index in range(options['announcements'])
+        ), batch_size=2000)
+        
+        categories = GalleryCategory.objects.using(self.database).bulk_create([GalleryCategory(name=f"Bench {index}") for index in range(10)])
+        GalleryImage.objects.using(self.database).bulk_create((
+            GalleryImage(
+                title=f"Image {index}",
+                image='gallery/bench.jpg',
+                category=self.random.choice(categories),
+                is_published=self.random.random() > 0.2,
+                event_date=today - timedelta(days=self.random.randrange(1000)),
+            )
+            for index in range(options['images'])
+        ), batch_size=2000)
+        
+        return {
+            'student': self.random.choice(students),
+            'class': classes[0],
+            'term': terms[1],
+            'day': school_days[5],
+            'category': categories[0],
+            'today': today,
+        }
+    
+    def hot_queries(self, sample):
+        """(label, queryset) for each query path the indexes are meant for, mirroring the views"""
+        student = sample['student']
+        now = timezone.now()
+        return [
+            ('Result(student, term)', Result.objects.using(self.database).filter(student_id=student.id, term_id=sample['term'].id)),
+            ('Attendance(class_obj, date)', Attendance.objects.using(self.database).filter(class_obj_id=sample['class'].id, date=sample['day'])),
+            ('Fee(status, due_date)', Fee.objects.using(self.database).filter(
+                status__in=['PENDING', 'PARTIAL'],
+                due_date__gte=sample['today'] - timedelta(days=7),
+                due_date__lte=sample['today'] + timedelta(days=7),
+            )),
+            ('Announcement(published, audience)', Announcement.objects.using(self.database).filter(
+                is_published=True, publish_date__lte=now, audience__in=['ALL', 'PARENTS']
+            ).order_by('-publish_date')[:20]),
+            ('GalleryImage(published)', GalleryImage.objects.using(self.database).filter(is_published=True).order_by('-event_date', '-created_at')[:20]),
+            ('GalleryImage(published, category)', GalleryImage.objects.using(self.database).filter(
+                is_published=True, category_id=sample['category'].id
+            ).order_by('-event_date', '-created_at')[:20]),
+            ('Student(parent, is_active)', Student.objects.using(self.database).filter(parent_id=student.parent_id, is_active=True)),
+            ('Student(is_active) by name', Student.objects.using(self.database).filter(is_active=True).order_by('last_name', 'first_name')[:20]),
+        ]
+    
+    def analyze(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+    
+    def drop_indexes(self):
+        """Drop the benchmarked indexes inside the open transaction"""
+        schema_editor = self.connection.schema_editor(atomic=False)
+        quote = schema_editor.quote_name
+        with self.connection.cursor() as cursor:
+            for model, name in BENCHMARKED_INDEXES:
+                cursor.execute(schema_editor.sql_delete_index % {
+                    'name': quote(name),
+                    'table': quote(model._meta.db_table),
+                })
+    
+    def measure(self, label, queryset):
+        """Best time in ms over --runs runs"""
+        timings = []
+        for _ in range(self.options['runs']):
+            if self.connection.vendor == 'postgresql':
+                plan = queryset.explain(analyze=True)
+                timings.append(float(re.search(r'Execution Time: ([\d.]+) ms', plan).group(1)))
+            else:
+                plan = queryset.explain()
+                start = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - start) * 1000)
+        
+        if self.options['plans']:
+            self.stdout.write(f"\n{label}\n{plan}")
+        return min(timings)
@@ -0,0 +1,74 @@
+import time
+from io import BytesIO
+from django.core.management.base import BaseCommand
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate
+from results.grading import DEFAULT_GRADE_BANDS, CompiledGradingScale
+from results.pdf_generator import ReportCardTemplate, get_report_card_template
+
+
+def sample_context(index, subjects):
+    """A report card context shaped like real data, without touching the database"""
+    rows = [
+        [f"Subject {n}", '72.50', '100.00', '72.50%', 'B+', str(n + 1), '-']
+        for n in range(subjects)
+    ]
+    return {
+        'student_name': f"Student {index}",
+        'student_id': f"STU{index:05d}",
+        'class_name': 'Grade 10A',
+        'academic_year': '2024-2025',
+        'term_number': '1',
+        'rows': rows,
+        'total_marks_obtained': f"{72.5 * subjects:.2f}",
+        'total_marks_possible': f"{100 * subjects:.2f}",
+        'overall_percentage': '72.50%',
+        'overall_grade': 'B+',
+        'class_position': f"{index + 1} of 40",
+        'grading_scale': CompiledGradingScale(DEFAULT_GRADE_BANDS).table_rows(),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Compare per-card CPU time of rebuilding the report card layout against the shared template'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--cards', type=int, default=500, help='Number of report cards to render')
+        parser.add_argument('--subjects', type=int, default=8, help='Subjects per report card')
+    
+    def handle(self, *args, **options):
+        contexts = [sample_context(i, options['subjects']) for i in range(options['cards'])]
+        
+        def rebuilt_per_card(context):
+            return ReportCardTemplate().build_elements(context)
+        
+        def shared_template(context):
+            return get_report_card_template().build_elements(context)
+        
+        shared_template(contexts[0])  # build the template outside the timing
+        
+        self.stdout.write(f"Rendering {len(contexts)} cards with {options['subjects']} subjects each")
+        
+        timings = {}
+        for label, build in [('rebuilt per card', rebuilt_per_card), ('shared template', shared_template)]:
+            layout_start = time.process_time()
+            for context in contexts:
+                build(context)
+            layout_time = time.process_time() - layout_start
+            
+            render_start = time.process_time()
+            for context in contexts:
+                SimpleDocTemplate(BytesIO(), pagesize=A4).build(build(context))
+            render_time = time.process_time() - render_start
+            
+            timings[label] = (layout_time, render_time)
+            self.stdout.write(
+                f"{label:>18}: layout {layout_time / len(contexts) * 1000:.3f} ms/card, "
+                f"full render {render_time / len(contexts) * 1000:.3f} ms/card"
+            )
+        
+        before, after = timings['rebuilt per card'], timings['shared template']
+        self.stdout.write(self.style.SUCCESS(
+            f"Saved {(before[1] - after[1]) / len(contexts) * 1000:.3f} ms CPU per card "
+            f"({(1 - after[1] / before[1]) * 100:.1f}% of full render time)"
+        ))
@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from results.imports import import_results
+from results.models import Term
+
+
+class Command(BaseCommand):
+    help = 'Import exam results for a term from a CSV or XLSX file'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or XLSX file with student_id, subject_code, marks_obtained, total_marks and remarks columns')
+        parser.add_argument('--term', type=int, required=True, help='Term id the results belong to')
+        parser.add_argument('--batch-size', type=int, default=settings.RESULT_IMPORT_BATCH_SIZE, help='Rows upserted per transaction')
+    
+    def handle(self, *args, **options):
+        try:
+            term = Term.objects.get(id=options['term'])
+        except Term.DoesNotExist:
+            raise CommandError(f"Term {options['term']} does not exist")
+        
+        def report_progress(rows, imported, errors):
+            self.stdout.write(f"{rows} rows read, {imported} imported, {errors} errors")
+        
+        with open(options['path'], 'rb') as fileobj:
+            try:
+                summary = import_results(
+                    fileobj,
+                    options['path'],
+                    term,
+                    batch_size=options['batch_size'],
+                    progress=report_progress,
+                )
+            except ValueError as error:
+                raise CommandError(str(error))
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {summary['imported']} of {summary['rows']} rows"
+        ))
+        if summary['error_report']:
+            self.stdout.write(self.style.WARNING(
+                f"{summary['errors']} rows rejected, see {summary['error_report']} under MEDIA_ROOT"
+            ))
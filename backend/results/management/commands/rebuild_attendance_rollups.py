@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from results.models import ClassDailyAttendance, StudentMonthlyAttendance, ClassMonthlyAttendance
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily and monthly attendance rollups from Attendance data'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='Only rebuild from this date (YYYY-MM-DD)')
+        parser.add_argument('--end', help='Only rebuild up to this date (YYYY-MM-DD)')
+    
+    def handle(self, *args, **options):
+        dates = {}
+        for option in ('start', 'end'):
+            if options[option]:
+                try:
+                    dates[option] = parse_date(options[option])
+                except ValueError:
+                    dates[option] = None
+                if dates[option] is None:
+                    raise CommandError(f"--{option} must be a date (YYYY-MM-DD)")
+        
+        for rollup in (ClassDailyAttendance, StudentMonthlyAttendance, ClassMonthlyAttendance):
+            count = rollup.rebuild(**dates)
+            self.stdout.write(f"{rollup._meta.verbose_name_plural}: {count}")
+        
+        self.stdout.write(self.style.SUCCESS('Attendance rollups rebuilt'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from results.models import StudentTermSummary
+
+
+class Command(BaseCommand):
+    help = 'Rebuild StudentTermSummary rows from Result data'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--term', type=int, help='Only rebuild summaries for this term id')
+    
+    def handle(self, *args, **options):
+        term_ids = [options['term']] if options['term'] else None
+        count = StudentTermSummary.rebuild(term_ids=term_ids)
+        
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} term summaries"))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from results.models import Term
+from results.regrade import regrade_terms
+
+
+class Command(BaseCommand):
+    help = 'Recompute result grades with the current grading scales, one UPDATE per term'
+    
+    def add_arguments(self, parser):
+        scope = parser.add_mutually_exclusive_group()
+        scope.add_argument('--term', type=int, help='Only regrade this term id')
+        scope.add_argument('--academic-year', type=int, help='Only regrade terms of this academic year id')
+    
+    def handle(self, *args, **options):
+        terms = Term.objects.select_related('academic_year')
+        if options['term']:
+            terms = terms.filter(id=options['term'])
+        elif options['academic_year']:
+            terms = terms.filter(academic_year_id=options['academic_year'])
+        
+        terms = list(terms)
+        if not terms:
+            raise CommandError('No matching terms')
+        
+        def report_progress(term, changed):
+            self.stdout.write(f"{term}: {changed} results regraded")
+        
+        changed = regrade_terms(terms, progress=report_progress)
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"Regraded {sum(changed.values())} results across {len(terms)} terms"
+        ))
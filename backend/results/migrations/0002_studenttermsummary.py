@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('results', '0001_initial'),
+        ('students', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentTermSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_marks_obtained', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('total_marks_possible', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('percentage', models.DecimalField(decimal_places=2, default=0, max_digits=5)),
+                ('overall_grade', models.CharField(blank=True, max_length=2, null=True)),
+                ('subject_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='term_summaries', to='students.student')),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_summaries', to='results.term')),
+            ],
+            options={
+                'ordering': ['student_id', 'term_id'],
+                'unique_together': {('student', 'term')},
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    
+    dependencies = [
+        ('classes', '0001_initial'),
+        ('results', '0002_studenttermsummary'),
+    ]
+    
+    operations = [
+        migrations.CreateModel(
+            name='GradingScale',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('grade_level', models.IntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('academic_year', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='grading_scales', to='classes.academicyear')),
+            ],
+            options={
+                'ordering': ['academic_year', 'grade_level'],
+                'unique_together': {('academic_year', 'grade_level')},
+            },
+        ),
+        migrations.CreateModel(
+            name='GradeBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('grade', models.CharField(max_length=2)),
+                ('min_percentage', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('description', models.CharField(blank=True, max_length=50)),
+                ('scale', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bands', to='results.gradingscale')),
+            ],
+            options={
+                'ordering': ['scale', '-min_percentage'],
+                'unique_together': {('scale', 'grade')},
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    
+    dependencies = [
+        ('results', '0003_gradingscale'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+    
+    operations = [
+        migrations.CreateModel(
+            name='PendingResultNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('parent', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pending_result_notifications', to=settings.AUTH_USER_MODEL)),
+                ('result', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='pending_notification', to='results.result')),
+            ],
+            options={
+                'ordering': ['created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    
+    dependencies = [
+        ('classes', '0001_initial'),
+        ('results', '0004_pendingresultnotification'),
+        ('students', '0001_initial'),
+        ('teachers', '0001_initial'),
+    ]
+    
+    operations = [
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['-date', 'student', 'id'], name='attendance_date_student_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['-term', 'student', 'subject'], name='result_term_student_idx'),
+        ),
+    ]
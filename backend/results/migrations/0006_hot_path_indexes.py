@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    
+    dependencies = [
+        ('classes', '0001_initial'),
+        ('results', '0005_keyset_indexes'),
+        ('students', '0001_initial'),
+        ('teachers', '0001_initial'),
+    ]
+    
+    operations = [
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['class_obj', 'date'], name='attendance_class_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fee',
+            index=models.Index(fields=['status', 'due_date'], name='fee_status_due_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['student', 'term'], name='result_student_term_idx'),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    
+    dependencies = [
+        ('classes', '0001_initial'),
+        ('results', '0006_hot_path_indexes'),
+        ('students', '0002_hot_path_indexes'),
+    ]
+    
+    operations = [
+        migrations.CreateModel(
+            name='ClassDailyAttendance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('present', models.PositiveIntegerField(default=0)),
+                ('absent', models.PositiveIntegerField(default=0)),
+                ('late', models.PositiveIntegerField(default=0)),
+                ('excused', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('date', models.DateField()),
+                ('class_obj', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_attendance', to='classes.class')),
+            ],
+            options={
+                'ordering': ['class_obj_id', 'date'],
+                'unique_together': {('class_obj', 'date')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ClassMonthlyAttendance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('present', models.PositiveIntegerField(default=0)),
+                ('absent', models.PositiveIntegerField(default=0)),
+                ('late', models.PositiveIntegerField(default=0)),
+                ('excused', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('month', models.DateField()),
+                ('class_obj', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_attendance', to='classes.class')),
+            ],
+            options={
+                'ordering': ['class_obj_id', 'month'],
+                'unique_together': {('class_obj', 'month')},
+            },
+        ),
+        migrations.CreateModel(
+            name='StudentMonthlyAttendance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('present', models.PositiveIntegerField(default=0)),
+                ('absent', models.PositiveIntegerField(default=0)),
+                ('late', models.PositiveIntegerField(default=0)),
+                ('excused', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('month', models.DateField()),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_attendance', to='students.student')),
+            ],
+            options={
+                'ordering': ['student_id', 'month'],
+                'unique_together': {('student', 'month')},
+            },
+        ),
+    ]
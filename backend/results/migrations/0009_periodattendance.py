@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    
+    dependencies = [
+        ('classes', '0001_initial'),
+        ('results', '0008_jobwatermark'),
+        ('students', '0002_hot_path_indexes'),
+    ]
+    
+    operations = [
+        migrations.CreateModel(
+            name='PeriodAttendance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('periods', models.CharField(default='------------', max_length=12)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('class_obj', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='period_attendance', to='classes.class')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='period_attendance', to='students.student')),
+            ],
+            options={
+                'ordering': ['-date', 'student'],
+                'indexes': [models.Index(fields=['class_obj', 'date'], name='period_att_class_date_idx')],
+                'unique_together': {('student', 'date')},
+            },
+        ),
+    ]
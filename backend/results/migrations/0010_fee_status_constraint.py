@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:26
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fix_fee_statuses(apps, schema_editor):
+    """Rewrite statuses that contradict the payments (or the due date) before they are constrained"""
+    Fee = apps.get_model('results', 'Fee')
+    status = models.Case(
+        models.When(amount_paid__gte=models.F('amount'), then=models.Value('PAID')),
+        models.When(due_date__lt=timezone.localdate(), then=models.Value('OVERDUE')),
+        models.When(amount_paid__gt=0, then=models.Value('PARTIAL')),
+        default=models.Value('PENDING'),
+        output_field=models.CharField(),
+    )
+    Fee.objects.exclude(status=status).update(status=status)
+
+
+class Migration(migrations.Migration):
+    
+    dependencies = [
+        ('results', '0009_periodattendance'),
+        ('students', '0002_hot_path_indexes'),
+    ]
+    
+    operations = [
+        migrations.RunPython(fix_fee_statuses, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='fee',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('amount_paid__gte', models.F('amount')), ('status', 'PAID')), models.Q(('amount_paid__gt', 0), ('amount_paid__lt', models.F('amount')), ('status', 'PARTIAL')), models.Q(('amount_paid__lt', models.F('amount')), ('amount_paid__lte', 0), ('status', 'PENDING')), models.Q(('amount_paid__lt', models.F('amount')), ('status', 'OVERDUE')), _connector='OR'), name='fee_status_matches_payment'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:53
+
+from django.db import migrations, models
+
+
+def check_duplicate_scales(apps, schema_editor):
+    """Refuse to go on while scales share a year and level, since only one of them was ever applied"""
+    GradingScale = apps.get_model('results', 'GradingScale')
+    duplicates = (
+        GradingScale.objects.values('academic_year_id', 'grade_level')
+        .annotate(scales=models.Count('id'))
+        .filter(scales__gt=1)
+    )
+    if duplicates:
+        keys = ', '.join(f"year {row['academic_year_id']} / level {row['grade_level']}" for row in duplicates)
+        raise RuntimeError(f"Delete or merge the duplicate grading scales before migrating: {keys}")
+
+
+class Migration(migrations.Migration):
+    
+    dependencies = [
+        ('classes', '0001_initial'),
+        ('results', '0011_queuedtask'),
+    ]
+    
+    operations = [
+        migrations.RunPython(check_duplicate_scales, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='gradingscale',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='gradingscale',
+            constraint=models.UniqueConstraint(fields=('academic_year', 'grade_level'), name='grading_scale_year_level_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='gradingscale',
+            constraint=models.UniqueConstraint(condition=models.Q(('grade_level__isnull', True)), fields=('academic_year',), name='grading_scale_year_unique', violation_error_message='This academic year already has a grading scale for all grade levels.'),
+        ),
+        migrations.AddConstraint(
+            model_name='gradingscale',
+            constraint=models.UniqueConstraint(condition=models.Q(('academic_year__isnull', True)), fields=('grade_level',), name='grading_scale_level_unique', violation_error_message='This grade level already has a grading scale for all academic years.'),
+        ),
+        migrations.AddConstraint(
+            model_name='gradingscale',
+            constraint=models.UniqueConstraint(models.Value(True), condition=models.Q(('academic_year__isnull', True), ('grade_level__isnull', True)), name='grading_scale_school_unique', violation_error_message='A school-wide grading scale already exists.'),
+        ),
+    ]
@@ -1,7 +1,13 @@
-from django.db import models
+from datetime import timedelta
+from django.db import models, transaction
+from django.db.models.functions import Substr, TruncMonth
+from django.db.models.lookups import GreaterThan, GreaterThanOrEqual
+from django.utils import timezone
+from django.conf import settings
 from students.models import Student
 from classes.models import Subject, Class, AcademicYear
 from teachers.models import Teacher
+from .grading import get_grading_scale
 
 class Term(models.Model):
     """
@@ -31,6 +37,79 @@ class Term(models.Model):
         return f"{self.get_term_number_display()} - {self.academic_year.year}"
 
 
+class GradingScale(models.Model):
+    """
+    Grade boundaries for an academic year and/or grade level.
+    Leave both empty for a school-wide scale.
+    """
+    name = models.CharField(max_length=100)
+    academic_year = models.ForeignKey(
+        AcademicYear,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='grading_scales'
+    )
+    grade_level = models.IntegerField(null=True, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['academic_year', 'grade_level']
+        constraints = [
+            # NULLs never collide in a unique index, so each pattern of empty fields gets its own
+            # constraint: one scale per year and level, per year, per level and one school-wide
+            models.UniqueConstraint(
+                fields=['academic_year', 'grade_level'],
+                name='grading_scale_year_level_unique',
+            ),
+            models.UniqueConstraint(
+                fields=['academic_year'],
+                condition=models.Q(grade_level__isnull=True),
+                name='grading_scale_year_unique',
+                violation_error_message='This academic year already has a grading scale for all grade levels.',
+            ),
+            models.UniqueConstraint(
+                fields=['grade_level'],
+                condition=models.Q(academic_year__isnull=True),
+                name='grading_scale_level_unique',
+                violation_error_message='This grade level already has a grading scale for all academic years.',
+            ),
+            models.UniqueConstraint(
+                models.Value(True),
+                condition=models.Q(academic_year__isnull=True, grade_level__isnull=True),
+                name='grading_scale_school_unique',
+                violation_error_message='A school-wide grading scale already exists.',
+            ),
+        ]
+    
+    def __str__(self):
+        return self.name
+
+
+class GradeBand(models.Model):
+    """
+    One grade of a grading scale, awarded from min_percentage
+    up to the next band's minimum
+    """
+    scale = models.ForeignKey(
+        GradingScale,
+        on_delete=models.CASCADE,
+        related_name='bands'
+    )
+    grade = models.CharField(max_length=2)
+    min_percentage = models.DecimalField(max_digits=5, decimal_places=2)
+    description = models.CharField(max_length=50, blank=True)
+    
+    class Meta:
+        unique_together = ['scale', 'grade']
+        ordering = ['scale', '-min_percentage']
+    
+    def __str__(self):
+        return f"{self.grade} ({self.min_percentage}%+)"
+
+
 class Result(models.Model):
     """
     Student exam results
@@ -70,6 +149,12 @@ class Result(models.Model):
     class Meta:
         unique_together = ['student', 'subject', 'term']
         ordering = ['-term', 'student', 'subject']
+        indexes = [
+            # Keyset pagination of the result list
+            models.Index(fields=['-term', 'student', 'subject'], name='result_term_student_idx'),
+            # A student's results for a term (summaries, report cards)
+            models.Index(fields=['student', 'term'], name='result_student_term_idx'),
+        ]
     
     def __str__(self):
         return f"{self.student.full_name} - {self.subject.name} - {self.term}"
@@ -78,23 +163,12 @@ class Result(models.Model):
     def percentage(self):
         return (self.marks_obtained / self.total_marks) * 100
     
-    def calculate_grade(self):
-        """Calculate grade based on percentage"""
-        percentage = self.percentage
-        if percentage >= 90:
-            return 'A+'
-        elif percentage >= 80:
-            return 'A'
-        elif percentage >= 70:
-            return 'B+'
-        elif percentage >= 60:
-            return 'B'
-        elif percentage >= 50:
-            return 'C'
-        elif percentage >= 40:
-            return 'D'
-        else:
-            return 'F'
+    def calculate_grade(self, scale=None):
+        """Calculate grade based on percentage, on the scale of the student's class grade level"""
+        if scale is None:
+            grade_level = self.student.current_class.grade_level if self.student.current_class_id else None
+            scale = get_grading_scale(self.term.academic_year_id, grade_level)
+        return scale.grade_for(self.percentage)
     
     def save(self, *args, **kwargs):
         if not self.grade:
@@ -102,6 +176,171 @@ class Result(models.Model):
         super().save(*args, **kwargs)
 
 
+class PendingResultNotification(models.Model):
+    """
+    A posted result waiting to go out in its parent's next digest email
+    """
+    result = models.OneToOneField(
+        Result,
+        on_delete=models.CASCADE,
+        related_name='pending_notification'
+    )
+    parent = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='pending_result_notifications'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['created_at']
+    
+    def __str__(self):
+        return f"{self.parent} - {self.result}"
+
+
+class StudentTermSummary(models.Model):
+    """
+    Per student and term totals, kept in step with Result rows
+    so summaries don't re-aggregate results on every read
+    """
+    student = models.ForeignKey(
+        Student,
+        on_delete=models.CASCADE,
+        related_name='term_summaries'
+    )
+    term = models.ForeignKey(
+        Term,
+        on_delete=models.CASCADE,
+        related_name='student_summaries'
+    )
+    
+    total_marks_obtained = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    total_marks_possible = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    percentage = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+    overall_grade = models.CharField(max_length=2, blank=True, null=True)
+    subject_count = models.PositiveIntegerField(default=0)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    # Fields rewritten whenever the summary is recalculated
+    TOTAL_FIELDS = [
+        'total_marks_obtained',
+        'total_marks_possible',
+        'percentage',
+        'overall_grade',
+        'subject_count',
+        'updated_at',
+    ]
+    
+    class Meta:
+        unique_together = ['student', 'term']
+        ordering = ['student_id', 'term_id']
+    
+    def __str__(self):
+        return f"{self.student.full_name} - {self.term} - {self.percentage}%"
+    
+    @classmethod
+    def _from_totals(cls, student_id, term_id, totals, scale=None):
+        if scale is None:
+            scale = get_grading_scale(totals['academic_year_id'], totals['grade_level'])
+        obtained = totals['obtained'] or 0
+        possible = totals['possible'] or 0
+        percentage = round(obtained / possible * 100, 2) if possible > 0 else 0
+        return cls(
+            student_id=student_id,
+            term_id=term_id,
+            total_marks_obtained=obtained,
+            total_marks_possible=possible,
+            percentage=percentage,
+            overall_grade=scale.grade_for(percentage) if possible > 0 else None,
+            subject_count=totals['subjects'],
+        )
+    
+    @classmethod
+    def refresh(cls, student_id, term_id):
+        """Recalculate the summary for one student and term from their results"""
+        # Grouping on the term's year and the student's grade level yields one row
+        totals = next(iter(
+            Result.objects.filter(student_id=student_id, term_id=term_id)
+            .order_by()
+            .values(academic_year_id=models.F('term__academic_year_id'), grade_level=models.F('student__current_class__grade_level'))
+            .annotate(
+                obtained=models.Sum('marks_obtained'),
+                possible=models.Sum('total_marks'),
+                subjects=models.Count('id'),
+            )
+        ), None)
+        
+        if not totals:
+            cls.objects.filter(student_id=student_id, term_id=term_id).delete()
+            return None
+        
+        summary = cls._from_totals(student_id, term_id, totals)
+        cls.objects.bulk_create(
+            [summary],
+            update_conflicts=True,
+            unique_fields=['student', 'term'],
+            update_fields=cls.TOTAL_FIELDS,
+        )
+        return summary
+    
+    @classmethod
+    def rebuild(cls, student_ids=None, term_ids=None):
+        """
+        Recalculate summaries for the given students and terms (everything
+        by default) with one grouped query, dropping summaries whose results
+        are all gone. Returns the number of summaries written.
+        """
+        results = Result.objects.all()
+        summaries = cls.objects.all()
+        if student_ids is not None:
+            results = results.filter(student_id__in=student_ids)
+            summaries = summaries.filter(student_id__in=student_ids)
+        if term_ids is not None:
+            results = results.filter(term_id__in=term_ids)
+            summaries = summaries.filter(term_id__in=term_ids)
+        
+        summaries.exclude(
+            models.Exists(Result.objects.filter(
+                student_id=models.OuterRef('student_id'),
+                term_id=models.OuterRef('term_id'),
+            ))
+        ).delete()
+        
+        grouped = (
+            results.order_by()
+            .values(
+                'student_id',
+                'term_id',
+                academic_year_id=models.F('term__academic_year_id'),
+                grade_level=models.F('student__current_class__grade_level'),
+            )
+            .annotate(
+                obtained=models.Sum('marks_obtained'),
+                possible=models.Sum('total_marks'),
+                subjects=models.Count('id'),
+            )
+        )
+        # One scale lookup per year and grade level, not per summary
+        scales = {}
+        rebuilt = []
+        for row in grouped:
+            key = (row['academic_year_id'], row['grade_level'])
+            if key not in scales:
+                scales[key] = get_grading_scale(*key)
+            rebuilt.append(cls._from_totals(row['student_id'], row['term_id'], row, scales[key]))
+        
+        cls.objects.bulk_create(
+            rebuilt,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['student', 'term'],
+            update_fields=cls.TOTAL_FIELDS,
+        )
+        return len(rebuilt)
+
+
 class Attendance(models.Model):
     """
     Student attendance tracking
@@ -139,11 +378,293 @@ class Attendance(models.Model):
     class Meta:
         unique_together = ['student', 'date']
         ordering = ['-date', 'student']
+        indexes = [
+            # Keyset pagination of the attendance list
+            models.Index(fields=['-date', 'student', 'id'], name='attendance_date_student_idx'),
+            # A class register for a day or date range
+            models.Index(fields=['class_obj', 'date'], name='attendance_class_date_idx'),
+        ]
     
     def __str__(self):
         return f"{self.student.full_name} - {self.date} - {self.get_status_display()}"
 
 
+def month_bounds(day):
+    """First and last day of the month containing ``day``"""
+    first = day.replace(day=1)
+    following = (first + timedelta(days=32)).replace(day=1)
+    return first, following - timedelta(days=1)
+
+
+class AttendanceRollup(models.Model):
+    """
+    Counts of each attendance status for one owner (student or class) over
+    one period (day or month), maintained from Attendance rows so rates
+    are read without scanning the register.
+    """
+    present = models.PositiveIntegerField(default=0)
+    absent = models.PositiveIntegerField(default=0)
+    late = models.PositiveIntegerField(default=0)
+    excused = models.PositiveIntegerField(default=0)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    # Set by each rollup: the Attendance field it groups on and its period
+    owner_field = None
+    monthly = False
+    
+    # Status code -> counter field
+    STATUS_FIELDS = {'P': 'present', 'A': 'absent', 'L': 'late', 'E': 'excused'}
+    
+    class Meta:
+        abstract = True
+    
+    @classmethod
+    def status_counts(cls, prefix=''):
+        """Count(...) annotations of every status, for Attendance querysets"""
+        return {
+            field: models.Count('id', filter=models.Q(**{f"{prefix}status": code}))
+            for code, field in cls.STATUS_FIELDS.items()
+        }
+    
+    @classmethod
+    def rebuild(cls, owner_ids=None, start=None, end=None):
+        """
+        Recalculate the rollups of the given owners between two dates
+        (everything by default) with one grouped query. Monthly rollups
+        cover the whole months containing the dates. Returns the number
+        of rollups written.
+        """
+        records = Attendance.objects.all()
+        rollups = cls.objects.all()
+        period_field = 'month' if cls.monthly else 'date'
+        if cls.monthly:
+            start = start and month_bounds(start)[0]
+            end = end and month_bounds(end)[1]
+        
+        if owner_ids is not None:
+            records = records.filter(**{f"{cls.owner_field}_id__in": owner_ids})
+            rollups = rollups.filter(**{f"{cls.owner_field}_id__in": owner_ids})
+        if start:
+            records = records.filter(date__gte=start)
+            rollups = rollups.filter(**{f"{period_field}__gte": start})
+        if end:
+            records = records.filter(date__lte=end)
+            rollups = rollups.filter(**{f"{period_field}__lte": end})
+        
+        grouped = (
+            records.order_by()
+            .values(
+                owner_id=models.F(f"{cls.owner_field}_id"),
+                period=TruncMonth('date') if cls.monthly else models.F('date'),
+            )
+            .annotate(**cls.status_counts())
+        )
+        rebuilt = [
+            cls(**{
+                f"{cls.owner_field}_id": row['owner_id'],
+                period_field: row['period'],
+                **{field: row[field] for field in cls.STATUS_FIELDS.values()},
+            })
+            for row in grouped
+        ]
+        keys = {(getattr(rollup, f"{cls.owner_field}_id"), getattr(rollup, period_field)) for rollup in rebuilt}
+        
+        # Upserting instead of delete + insert lets concurrent rebuilds of
+        # the same rows both succeed; only periods whose attendance is all
+        # gone are deleted afterwards
+        with transaction.atomic():
+            cls.objects.bulk_create(
+                rebuilt,
+                batch_size=1000,
+                update_conflicts=True,
+                unique_fields=[cls.owner_field, period_field],
+                update_fields=[*cls.STATUS_FIELDS.values(), 'updated_at'],
+            )
+            stale = [
+                pk for pk, owner_id, period in rollups.values_list('pk', f"{cls.owner_field}_id", period_field)
+                if (owner_id, period) not in keys
+            ]
+            if stale:
+                cls.objects.filter(pk__in=stale).delete()
+        return len(rebuilt)
+
+
+class ClassDailyAttendance(AttendanceRollup):
+    """
+    Attendance counts of a class on one day
+    """
+    class_obj = models.ForeignKey(
+        Class,
+        on_delete=models.CASCADE,
+        related_name='daily_attendance'
+    )
+    date = models.DateField()
+    
+    owner_field = 'class_obj'
+    
+    class Meta:
+        unique_together = ['class_obj', 'date']
+        ordering = ['class_obj_id', 'date']
+    
+    def __str__(self):
+        return f"{self.class_obj.name} - {self.date}"
+
+
+class StudentMonthlyAttendance(AttendanceRollup):
+    """
+    Attendance counts of a student in one month (``month`` is its first day)
+    """
+    student = models.ForeignKey(
+        Student,
+        on_delete=models.CASCADE,
+        related_name='monthly_attendance'
+    )
+    month = models.DateField()
+    
+    owner_field = 'student'
+    monthly = True
+    
+    class Meta:
+        unique_together = ['student', 'month']
+        ordering = ['student_id', 'month']
+    
+    def __str__(self):
+        return f"{self.student.full_name} - {self.month:%B %Y}"
+
+
+class ClassMonthlyAttendance(AttendanceRollup):
+    """
+    Attendance counts of a class in one month (``month`` is its first day)
+    """
+    class_obj = models.ForeignKey(
+        Class,
+        on_delete=models.CASCADE,
+        related_name='monthly_attendance'
+    )
+    month = models.DateField()
+    
+    owner_field = 'class_obj'
+    monthly = True
+    
+    class Meta:
+        unique_together = ['class_obj', 'month']
+        ordering = ['class_obj_id', 'month']
+    
+    def __str__(self):
+        return f"{self.class_obj.name} - {self.month:%B %Y}"
+
+
+class PeriodAttendanceQuerySet(models.QuerySet):
+    @staticmethod
+    def _check_status(status):
+        # Codes end up in LIKE patterns, so only real statuses are accepted
+        if status not in dict(Attendance.STATUS_CHOICES):
+            raise ValueError(f"Unknown attendance status {status!r}")
+    
+    def with_status(self, period, status):
+        """Day rows where the given period (1-based) has the given status"""
+        self._check_status(status)
+        if not 1 <= period <= PeriodAttendance.MAX_PERIODS:
+            raise ValueError(f"Period must be between 1 and {PeriodAttendance.MAX_PERIODS}")
+        return self.annotate(
+            period_status=Substr('periods', period, 1)
+        ).filter(period_status=status)
+    
+    def with_any_status(self, status):
+        """Day rows where any period has the given status"""
+        self._check_status(status)
+        return self.filter(periods__contains=status)
+
+
+class PeriodAttendance(models.Model):
+    """
+    Period by period attendance of a student for one day, in a single row.
+    ``periods`` holds one status code per period, in order, with
+    UNMARKED for periods not taken yet, so a day costs one row and one
+    index entry instead of one per period.
+    """
+    MAX_PERIODS = 12
+    UNMARKED = '-'
+    
+    student = models.ForeignKey(
+        Student,
+        on_delete=models.CASCADE,
+        related_name='period_attendance'
+    )
+    class_obj = models.ForeignKey(
+        Class,
+        on_delete=models.CASCADE,
+        related_name='period_attendance'
+    )
+    date = models.DateField()
+    periods = models.CharField(max_length=MAX_PERIODS, default=UNMARKED * MAX_PERIODS)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    objects = PeriodAttendanceQuerySet.as_manager()
+    
+    class Meta:
+        unique_together = ['student', 'date']
+        ordering = ['-date', 'student']
+        indexes = [
+            models.Index(fields=['class_obj', 'date'], name='period_att_class_date_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.student.full_name} - {self.date} - {self.periods}"
+    
+    def status_for(self, period):
+        """Status code of a period (1-based), None when not marked"""
+        status = self.periods[period - 1:period]
+        return None if status in ('', self.UNMARKED) else status
+    
+    def expand(self, period_count=None):
+        """Statuses of the first ``period_count`` periods (PERIODS_PER_DAY by default)"""
+        period_count = period_count or settings.PERIODS_PER_DAY
+        return [self.status_for(period) for period in range(1, period_count + 1)]
+
+
+class QueuedTask(models.Model):
+    """
+    A background task queued from the API and the user who queued it,
+    so only they can follow its progress and download its result
+    """
+    KIND_CHOICES = [
+        ('REPORT_CARDS', 'Report card batch'),
+        ('RESULT_IMPORT', 'Results import'),
+    ]
+    
+    task_id = models.CharField(max_length=255, unique=True)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='queued_tasks'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.task_id} - {self.user}"
+
+
+class JobWatermark(models.Model):
+    """
+    How far an incremental scheduled job has got, so each run only
+    processes what is new since the last one
+    """
+    name = models.CharField(max_length=100, unique=True)
+    processed_until = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.name} - {self.processed_until}"
+
+
 class Fee(models.Model):
     """
     Student fee management
@@ -178,6 +699,25 @@ class Fee(models.Model):
     
     class Meta:
         ordering = ['-due_date']
+        indexes = [
+            # Reminder and overdue jobs select by status and due date
+            models.Index(fields=['status', 'due_date'], name='fee_status_due_date_idx'),
+        ]
+        constraints = [
+            # Bulk writes that skip save() cannot leave a status that contradicts the payments:
+            # they must set status=Fee.status_case(...) with the new amounts in the same UPDATE
+            # (or current_status() on each object for bulk_update). Whether an unpaid fee is
+            # PENDING or OVERDUE depends on the date, so refresh_statuses() keeps that.
+            models.CheckConstraint(
+                condition=(
+                    models.Q(status='PAID', amount_paid__gte=models.F('amount'))
+                    | models.Q(status='PARTIAL', amount_paid__gt=0, amount_paid__lt=models.F('amount'))
+                    | models.Q(status='PENDING', amount_paid__lte=0, amount_paid__lt=models.F('amount'))
+                    | models.Q(status='OVERDUE', amount_paid__lt=models.F('amount'))
+                ),
+                name='fee_status_matches_payment',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.student.full_name} - {self.term} - ${self.amount}"
@@ -186,12 +726,48 @@ class Fee(models.Model):
     def balance(self):
         return self.amount - self.amount_paid
     
-    def save(self, *args, **kwargs):
-        # Auto-update status based on payment
+    def current_status(self, today=None):
+        """The status the payments and due date call for; unpaid fees past due are overdue"""
         if self.amount_paid >= self.amount:
-            self.status = 'PAID'
-        elif self.amount_paid > 0:
-            self.status = 'PARTIAL'
-        else:
-            self.status = 'PENDING'
+            return 'PAID'
+        if self.due_date < (today or timezone.localdate()):
+            return 'OVERDUE'
+        if self.amount_paid > 0:
+            return 'PARTIAL'
+        return 'PENDING'
+    
+    @classmethod
+    def status_case(cls, today=None, amount=None, amount_paid=None):
+        """
+        current_status() as a SQL expression. Bulk updates of amount or
+        amount_paid must set status in the same UPDATE, passing the values
+        being written as expressions, e.g. update(amount_paid=F('amount'),
+        status=Fee.status_case(amount_paid=F('amount'))), since the other
+        expressions of an UPDATE see the old row. Otherwise the
+        fee_status_matches_payment constraint rejects the update.
+        """
+        amount = models.F('amount') if amount is None else amount
+        amount_paid = models.F('amount_paid') if amount_paid is None else amount_paid
+        return models.Case(
+            models.When(GreaterThanOrEqual(amount_paid, amount), then=models.Value('PAID')),
+            models.When(due_date__lt=today or timezone.localdate(), then=models.Value('OVERDUE')),
+            models.When(GreaterThan(amount_paid, 0), then=models.Value('PARTIAL')),
+            default=models.Value('PENDING'),
+            output_field=models.CharField(),
+        )
+    
+    @classmethod
+    def refresh_statuses(cls, today=None):
+        """
+        Bring every fee's status up to date with its due date in one UPDATE:
+        unpaid fees that fell due move to OVERDUE, and overdue fees whose
+        due date was extended go back to PENDING/PARTIAL. Returns the
+        number of fees changed.
+        """
+        status = cls.status_case(today)
+        return cls.objects.exclude(status=status).update(status=status, updated_at=timezone.now())
+    
+    def save(self, *args, **kwargs):
+        # Auto-update status based on payment and due date
+        self.status = self.current_status()
         super().save(*args, **kwargs)
\ No newline at end of file
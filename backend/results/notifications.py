@@ -0,0 +1,239 @@
+from collections import defaultdict
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Min
+from django.utils import timezone
+from students.models import Student
+from .models import Result, PendingResultNotification, Fee
+
+
+def notify_parents(results):
+    """
+    Let parents know about newly posted results.
+    With a digest window the results are buffered for send_result_digests,
+    otherwise each result is emailed on its own straight away.
+    """
+    result_ids = [result.pk for result in results if result.pk]
+    if not result_ids:
+        return
+    
+    if settings.RESULT_DIGEST_WINDOW_MINUTES <= 0:
+        from .tasks import send_result_notification
+        for result_id in result_ids:
+            send_result_notification.delay(result_id)
+        return
+    
+    parents = Result.objects.filter(id__in=result_ids).values_list('id', 'student__parent_id')
+    PendingResultNotification.objects.bulk_create(
+        [PendingResultNotification(result_id=result_id, parent_id=parent_id) for result_id, parent_id in parents],
+        ignore_conflicts=True,
+    )
+
+
+def due_digests(now=None):
+    """
+    Pending notifications grouped by parent, for every parent whose oldest
+    pending notification has waited out the digest window
+    """
+    cutoff = (now or timezone.now()) - timedelta(minutes=settings.RESULT_DIGEST_WINDOW_MINUTES)
+    due_parents = (
+        PendingResultNotification.objects.order_by()
+        .values('parent_id')
+        .annotate(oldest=Min('created_at'))
+        .filter(oldest__lte=cutoff)
+        .values('parent_id')
+    )
+    
+    pending = (
+        PendingResultNotification.objects.filter(parent_id__in=due_parents)
+        .select_related('parent', 'result__student', 'result__subject', 'result__term__academic_year')
+        .order_by('parent_id', 'result__student__first_name', 'result__term_id', 'result__subject__name')
+    )
+    
+    digests = defaultdict(list)
+    for notification in pending:
+        digests[notification.parent].append(notification)
+    return digests
+
+
+def build_digest_email(parent, notifications):
+    """One email listing every new result for all of a parent's children"""
+    by_student = defaultdict(list)
+    for notification in notifications:
+        by_student[notification.result.student].append(notification.result)
+    
+    sections = []
+    for student, results in by_student.items():
+        lines = [f"{student.full_name}:"]
+        for result in results:
+            lines.append(
+                f"- {result.subject.name} ({result.term}): "
+                f"{result.marks_obtained}/{result.total_marks} "
+                f"({result.percentage:.2f}%), Grade {result.grade}"
+            )
+        sections.append('\n'.join(lines))
+    
+    names = ', '.join(student.full_name for student in by_student)
+    subject = f"New Results Posted for {names}"
+    message = f"""
+Dear {parent.get_full_name()},
+
+New results have been posted for your {'child' if len(by_student) == 1 else 'children'}.
+
+{chr(10).join(sections)}
+
+You can view the complete report card by logging into the parent portal.
+
+Thank you,
+School Administration
+    """
+    
+    return EmailMessage(subject, message, settings.DEFAULT_FROM_EMAIL, [parent.email])
+
+
+def send_due_digests():
+    """
+    Email every due digest over one SMTP connection.
+    Each parent's notifications are cleared once their email is sent,
+    so a failure part way through only leaves the unsent ones pending.
+    Returns the number of emails sent.
+    """
+    digests = due_digests()
+    if not digests:
+        return 0
+    
+    sent = 0
+    connection = get_connection()
+    connection.open()
+    try:
+        for parent, notifications in digests.items():
+            if parent.email:
+                connection.send_messages([build_digest_email(parent, notifications)])
+                sent += 1
+            PendingResultNotification.objects.filter(
+                id__in=[notification.id for notification in notifications]
+            ).delete()
+    finally:
+        connection.close()
+    
+    return sent
+
+
+def build_absence_alert_email(parent, streaks, days):
+    """One email about every child of a parent who has been absent ``days`` school days in a row"""
+    lines = [
+        f"- {student.full_name}: absent since {started.strftime('%B %d, %Y')}"
+        for student, started in streaks
+    ]
+    names = ', '.join(student.full_name for student, _ in streaks)
+    subject = f"Attendance Alert for {names}"
+    message = f"""
+Dear {parent.get_full_name()},
+
+Our records show the following {'child has' if len(streaks) == 1 else 'children have'} been absent for {days} school days in a row:
+
+{chr(10).join(lines)}
+
+Please contact the school if you have not already let us know the reason.
+
+Thank you,
+School Administration
+    """
+    
+    return EmailMessage(subject, message, settings.DEFAULT_FROM_EMAIL, [parent.email])
+
+
+def send_absence_alerts(streaks, days):
+    """
+    Email the parents of the (student_id, first day, n-th day) streaks,
+    one email per parent, all over one SMTP connection.
+    Returns the number of emails sent.
+    """
+    started = {student_id: first_day for student_id, first_day, _ in streaks}
+    students = (
+        Student.objects.filter(id__in=started, is_active=True)
+        .select_related('parent')
+        .order_by('parent_id', 'first_name')
+    )
+    
+    by_parent = defaultdict(list)
+    for student in students:
+        if student.parent.email:
+            by_parent[student.parent].append((student, started[student.id]))
+    
+    messages = [build_absence_alert_email(parent, parent_streaks, days) for parent, parent_streaks in by_parent.items()]
+    if not messages:
+        return 0
+    return get_connection().send_messages(messages) or 0
+
+
+def due_fee_reminders(today=None, days_ahead=7):
+    """Unpaid fees falling due in the next ``days_ahead`` days, grouped by parent"""
+    today = today or timezone.localdate()
+    fees = (
+        Fee.objects.filter(
+            status__in=['PENDING', 'PARTIAL'],
+            due_date__gte=today,
+            due_date__lte=today + timedelta(days=days_ahead),
+        )
+        .select_related('student__parent', 'term__academic_year')
+        .order_by('student__parent_id', 'student__first_name', 'due_date')
+    )
+    
+    reminders = defaultdict(list)
+    for fee in fees:
+        reminders[fee.student.parent].append(fee)
+    return reminders
+
+
+def build_fee_reminder_email(parent, fees):
+    """One reminder listing every fee due soon for all of a parent's children"""
+    lines = [
+        f"- {fee.student.full_name}, {fee.term}: "
+        f"Amount ${fee.amount}, Paid ${fee.amount_paid}, Balance Due ${fee.balance}, "
+        f"Due {fee.due_date.strftime('%B %d, %Y')}"
+        for fee in fees
+    ]
+    names = ', '.join(dict.fromkeys(fee.student.full_name for fee in fees))
+    subject = f"Fee Reminder for {names}"
+    message = f"""
+Dear {parent.get_full_name()},
+
+This is a reminder about the pending {'fee' if len(fees) == 1 else 'fees'} for {names}.
+
+Fee Details:
+{chr(10).join(lines)}
+
+Total Balance Due: ${sum(fee.balance for fee in fees)}
+
+Please make the payment at your earliest convenience.
+
+Thank you,
+School Administration
+    """
+    
+    return EmailMessage(subject, message, settings.DEFAULT_FROM_EMAIL, [parent.email])
+
+
+def send_fee_reminder_emails(chunk_size=100):
+    """
+    Email each parent one reminder covering all their children's fees due
+    soon, handing the emails to one SMTP connection ``chunk_size`` at a time.
+    Returns (emails sent, fees covered).
+    """
+    reminders = due_fee_reminders()
+    messages = [build_fee_reminder_email(parent, fees) for parent, fees in reminders.items() if parent.email]
+    if not messages:
+        return 0, 0
+    
+    sent = 0
+    connection = get_connection()
+    connection.open()
+    try:
+        for start in range(0, len(messages), chunk_size):
+            sent += connection.send_messages(messages[start:start + chunk_size]) or 0
+    finally:
+        connection.close()
+    
+    return sent, sum(len(fees) for parent, fees in reminders.items() if parent.email)
@@ -0,0 +1,168 @@
+import base64
+import json
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on a composite key, e.g. ('-date', 'student_id', 'id').
+    
+    Each page is fetched with a WHERE clause on the key of the last row seen
+    instead of an OFFSET, and no COUNT(*) is run, so page N costs the same
+    as page 1 when an index matches the key. The key must be unique and is
+    taken from the view's ``keyset_ordering``. Works for querysets of model
+    instances as well as .values() dicts that include the key columns.
+    """
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    invalid_cursor_message = 'Invalid cursor'
+    
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+    
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            return list(cursor['key']), bool(cursor.get('reverse'))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+    
+    def encode_cursor(self, row, reverse=False):
+        key = [self._key_value(row, field) for field in self.ordering]
+        cursor = {'key': key, 'reverse': True} if reverse else {'key': key}
+        encoded = base64.urlsafe_b64encode(json.dumps(cursor, default=str).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+    
+    def clean_key(self, model, key):
+        """The cursor's key values converted to the key fields' types"""
+        cleaned = []
+        for field, value in zip(self.ordering, key):
+            try:
+                value = model._meta.get_field(field.lstrip('-')).to_python(value)
+            except (ValueError, TypeError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+            if value is None:
+                raise NotFound(self.invalid_cursor_message)
+            cleaned.append(value)
+        return cleaned
+    
+    @staticmethod
+    def _key_value(row, field):
+        name = field.lstrip('-')
+        return row[name] if isinstance(row, dict) else getattr(row, name)
+    
+    @staticmethod
+    def _past(ordering, key, reverse):
+        """Rows strictly after ``key`` in ``ordering`` (before it when reversed)"""
+        condition = Q()
+        for position, field in enumerate(ordering):
+            name = field.lstrip('-')
+            descending = field.startswith('-') != reverse
+            step = Q(**{f"{name}__{'lt' if descending else 'gt'}": key[position]})
+            for previous, value in zip(ordering[:position], key[:position]):
+                step &= Q(**{previous.lstrip('-'): value})
+            condition |= step
+        return condition
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        self.ordering = list(view.keyset_ordering)
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        
+        key, reverse = self.decode_cursor(request)
+        if len(key or []) not in (0, len(self.ordering)):
+            raise NotFound(self.invalid_cursor_message)
+        if key:
+            key = self.clean_key(queryset.model, key)
+        
+        order_by = self.ordering
+        if reverse:
+            order_by = [field[1:] if field.startswith('-') else f"-{field}" for field in self.ordering]
+        
+        queryset = queryset.order_by(*order_by)
+        if key:
+            queryset = queryset.filter(self._past(self.ordering, key, reverse))
+        
+        # One extra row tells whether there is another page
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, key is not None
+        
+        self.page = rows
+        return rows
+    
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1])
+    
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+    
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+    
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class KeysetOrPageNumberPagination(BasePagination):
+    """
+    Page number pagination by default, keyset pagination (no count, no
+    OFFSET) when the request asks for it with ?cursor= (empty for the
+    first page). Existing clients keep their page numbers and totals.
+    """
+    def __init__(self):
+        self.keyset = KeysetPagination()
+        self.page_number = PageNumberPagination()
+        self.active = self.page_number
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.keyset.cursor_query_param in request.query_params:
+            self.active = self.keyset
+        else:
+            self.active = self.page_number
+        return self.active.paginate_queryset(queryset, request, view)
+    
+    def get_paginated_response(self, data):
+        return self.active.get_paginated_response(data)
+    
+    def get_paginated_response_schema(self, schema):
+        return self.page_number.get_paginated_response_schema(schema)
@@ -1,54 +1,82 @@
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from io import BytesIO
-from django.db.models import Sum, Avg
-from .models import Result
+from copy import copy
+from .models import Result, StudentTermSummary
+from .ranking import get_class_ranks
+from .grading import get_grading_scale
 
-def generate_report_card(student, term):
-    """Generate PDF report card for a student"""
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
-    elements = []
-    styles = getSampleStyleSheet()
+def build_report_card_context(student, term, results, summary=None, ranks=None, scale=None):
+    """
+    Collect everything a report card shows as plain data.
+    Totals are taken from the student's StudentTermSummary when given,
+    positions from the class ranks returned by results.ranking and the
+    grading table from the scale for the student's year and grade level.
+    The context is picklable, so it can be rendered in another process.
+    """
+    if scale is None:
+        scale = get_grading_scale(
+            term.academic_year_id,
+            student.current_class.grade_level if student.current_class else None
+        )
     
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#1976d2'),
-        spaceAfter=30,
-        alignment=TA_CENTER,
-    )
+    rows = []
+    total_marks_obtained = 0
+    total_marks_possible = 0
+    student_ranks = (ranks or {}).get('students', {}).get(student.id)
     
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        textColor=colors.HexColor('#333333'),
-        spaceAfter=12,
-    )
-    
-    # Title
-    title = Paragraph("STUDENT REPORT CARD", title_style)
-    elements.append(title)
-    elements.append(Spacer(1, 0.3*inch))
+    for result in results:
+        subject_rank = student_ranks['subjects'].get(result.subject_id) if student_ranks else None
+        rows.append([
+            result.subject.name,
+            str(result.marks_obtained),
+            str(result.total_marks),
+            f"{result.percentage:.2f}%",
+            result.grade,
+            str(subject_rank) if subject_rank else '-',
+            result.remarks or '-'
+        ])
+        total_marks_obtained += result.marks_obtained
+        total_marks_possible += result.total_marks
     
-    # Student Information
-    student_info = [
-        ['Student Name:', student.full_name],
-        ['Student ID:', student.student_id],
-        ['Class:', student.current_class.name if student.current_class else 'Not Assigned'],
-        ['Academic Year:', term.academic_year.year],
-        ['Term:', f"Term {term.term_number}"],
-    ]
+    if summary is not None:
+        total_marks_obtained = summary.total_marks_obtained
+        total_marks_possible = summary.total_marks_possible
+        overall_percentage = summary.percentage
+        overall_grade = summary.overall_grade
+    else:
+        overall_percentage = (total_marks_obtained / total_marks_possible * 100) if total_marks_possible > 0 else 0
+        overall_grade = scale.grade_for(overall_percentage)
     
-    student_table = Table(student_info, colWidths=[2*inch, 4*inch])
-    student_table.setStyle(TableStyle([
+    return {
+        'student_name': student.full_name,
+        'student_id': student.student_id,
+        'class_name': student.current_class.name if student.current_class else 'Not Assigned',
+        'academic_year': term.academic_year.year,
+        'term_number': term.term_number,
+        'rows': rows,
+        'total_marks_obtained': str(total_marks_obtained),
+        'total_marks_possible': str(total_marks_possible),
+        'overall_percentage': f"{overall_percentage:.2f}%",
+        'overall_grade': overall_grade,
+        'class_position': f"{student_ranks['position']} of {ranks['class_size']}" if student_ranks else None,
+        'grading_scale': scale.table_rows(),
+    }
+
+
+class ReportCardTemplate:
+    """
+    Report card layout with every student-independent block built once.
+    Styles, headings and the footer are built for the process and handed
+    out as shallow copies, since ReportLab records layout state on
+    flowables. Grading scale tables are built once per distinct scale.
+    Only the student information and results tables are built per card.
+    """
+    STUDENT_TABLE_STYLE = TableStyle([
         ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f5f5f5')),
         ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
         ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
@@ -57,102 +85,25 @@ def generate_report_card(student, term):
         ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
         ('TOPPADDING', (0, 0), (-1, -1), 8),
         ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-    ]))
-    
-    elements.append(student_table)
-    elements.append(Spacer(1, 0.3*inch))
+    ])
     
-    # Academic Performance
-    heading = Paragraph("Academic Performance", heading_style)
-    elements.append(heading)
-    
-    # Get results
-    results = Result.objects.filter(student=student, term=term).select_related('subject')
-    
-    if results.exists():
-        # Results table
-        data = [['Subject', 'Marks Obtained', 'Total Marks', 'Percentage', 'Grade', 'Remarks']]
-        
-        for result in results:
-            data.append([
-                result.subject.name,
-                str(result.marks_obtained),
-                str(result.total_marks),
-                f"{result.percentage:.2f}%",
-                result.grade,
-                result.remarks or '-'
-            ])
-        
-        # Calculate totals
-        total_marks_obtained = results.aggregate(Sum('marks_obtained'))['marks_obtained__sum']
-        total_marks_possible = results.aggregate(Sum('total_marks'))['total_marks__sum']
-        overall_percentage = (total_marks_obtained / total_marks_possible * 100) if total_marks_possible > 0 else 0
-        
-        # Calculate overall grade
-        if overall_percentage >= 90:
-            overall_grade = 'A+'
-        elif overall_percentage >= 80:
-            overall_grade = 'A'
-        elif overall_percentage >= 70:
-            overall_grade = 'B+'
-        elif overall_percentage >= 60:
-            overall_grade = 'B'
-        elif overall_percentage >= 50:
-            overall_grade = 'C'
-        elif overall_percentage >= 40:
-            overall_grade = 'D'
-        else:
-            overall_grade = 'F'
-        
-        # Add totals row
-        data.append([
-            'TOTAL/OVERALL',
-            str(total_marks_obtained),
-            str(total_marks_possible),
-            f"{overall_percentage:.2f}%",
-            overall_grade,
-            ''
-        ])
-        
-        results_table = Table(data, colWidths=[1.8*inch, 1*inch, 1*inch, 1*inch, 0.7*inch, 1.5*inch])
-        results_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1976d2')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('TOPPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#e3f2fd')),
-            ('FONTNAME', (0, -1), (0, -1), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -2), [colors.white, colors.HexColor('#f9f9f9')]),
-        ]))
-        
-        elements.append(results_table)
-    else:
-        no_results = Paragraph("No results available for this term.", styles['Normal'])
-        elements.append(no_results)
-    
-    elements.append(Spacer(1, 0.3*inch))
-    
-    # Grading Scale
-    heading = Paragraph("Grading Scale", heading_style)
-    elements.append(heading)
+    RESULTS_TABLE_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1976d2')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('TOPPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#e3f2fd')),
+        ('FONTNAME', (0, -1), (0, -1), 'Helvetica-Bold'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -2), [colors.white, colors.HexColor('#f9f9f9')]),
+    ])
     
-    grading_data = [
-        ['Grade', 'Percentage Range', 'Description'],
-        ['A+', '90% - 100%', 'Excellent'],
-        ['A', '80% - 89%', 'Very Good'],
-        ['B+', '70% - 79%', 'Good'],
-        ['B', '60% - 69%', 'Above Average'],
-        ['C', '50% - 59%', 'Average'],
-        ['D', '40% - 49%', 'Below Average'],
-        ['F', 'Below 40%', 'Fail'],
-    ]
+    GRADING_HEADER = ['Grade', 'Percentage Range', 'Description']
     
-    grading_table = Table(grading_data, colWidths=[1*inch, 2*inch, 2*inch])
-    grading_table.setStyle(TableStyle([
+    GRADING_TABLE_STYLE = TableStyle([
         ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#424242')),
         ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
         ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
@@ -162,19 +113,157 @@ def generate_report_card(student, term):
         ('TOPPADDING', (0, 0), (-1, -1), 6),
         ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
         ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')]),
-    ]))
+    ])
+    
+    def __init__(self):
+        styles = getSampleStyleSheet()
+        self.normal_style = styles['Normal']
+        
+        # Custom styles
+        title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor=colors.HexColor('#1976d2'),
+            spaceAfter=30,
+            alignment=TA_CENTER,
+        )
+        
+        heading_style = ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=14,
+            textColor=colors.HexColor('#333333'),
+            spaceAfter=12,
+        )
+        
+        self.title = Paragraph("STUDENT REPORT CARD", title_style)
+        self.performance_heading = Paragraph("Academic Performance", heading_style)
+        self.grading_heading = Paragraph("Grading Scale", heading_style)
+        self.no_results = Paragraph("No results available for this term.", self.normal_style)
+        self.section_spacer = Spacer(1, 0.3*inch)
+        self.footer_spacer = Spacer(1, 0.5*inch)
+        
+        self._grading_tables = {}
+        
+        # Footer
+        self.footer = Paragraph(
+            "This is a computer-generated report. No signature is required.",
+            ParagraphStyle('Footer', parent=styles['Normal'], fontSize=8, textColor=colors.grey, alignment=TA_CENTER)
+        )
     
-    elements.append(grading_table)
-    elements.append(Spacer(1, 0.5*inch))
+    def grading_table(self, rows):
+        """A copy of the grading scale table for these rows, built on first use"""
+        key = tuple(tuple(row) for row in rows)
+        if key not in self._grading_tables:
+            table = Table([self.GRADING_HEADER] + [list(row) for row in rows], colWidths=[1*inch, 2*inch, 2*inch])
+            table.setStyle(self.GRADING_TABLE_STYLE)
+            self._grading_tables[key] = table
+        return copy(self._grading_tables[key])
     
-    # Footer
-    footer_text = Paragraph(
-        "This is a computer-generated report. No signature is required.",
-        ParagraphStyle('Footer', parent=styles['Normal'], fontSize=8, textColor=colors.grey, alignment=TA_CENTER)
-    )
-    elements.append(footer_text)
+    def build_elements(self, context):
+        """Build the flowables for one report card from its context"""
+        elements = [copy(self.title), copy(self.section_spacer)]
+        
+        # Student Information
+        student_info = [
+            ['Student Name:', context['student_name']],
+            ['Student ID:', context['student_id']],
+            ['Class:', context['class_name']],
+            ['Academic Year:', context['academic_year']],
+            ['Term:', f"Term {context['term_number']}"],
+        ]
+        if context.get('class_position'):
+            student_info.append(['Position in Class:', context['class_position']])
+        
+        student_table = Table(student_info, colWidths=[2*inch, 4*inch])
+        student_table.setStyle(self.STUDENT_TABLE_STYLE)
+        
+        elements.append(student_table)
+        elements.append(copy(self.section_spacer))
+        
+        # Academic Performance
+        elements.append(copy(self.performance_heading))
+        
+        if context['rows']:
+            # Results table
+            data = [['Subject', 'Marks Obtained', 'Total Marks', 'Percentage', 'Grade', 'Rank', 'Remarks']]
+            data.extend(context['rows'])
+            
+            # Add totals row
+            data.append([
+                'TOTAL/OVERALL',
+                context['total_marks_obtained'],
+                context['total_marks_possible'],
+                context['overall_percentage'],
+                context['overall_grade'],
+                '',
+                ''
+            ])
+            
+            results_table = Table(data, colWidths=[1.6*inch, 1*inch, 0.9*inch, 0.9*inch, 0.6*inch, 0.6*inch, 1.3*inch])
+            results_table.setStyle(self.RESULTS_TABLE_STYLE)
+            
+            elements.append(results_table)
+        else:
+            elements.append(copy(self.no_results))
+        
+        elements.append(copy(self.section_spacer))
+        
+        # Grading Scale
+        elements.append(copy(self.grading_heading))
+        elements.append(self.grading_table(context['grading_scale']))
+        elements.append(copy(self.footer_spacer))
+        
+        # Footer
+        elements.append(copy(self.footer))
+        
+        return elements
+
+
+_template = None
+
+
+def get_report_card_template():
+    """Return this process's report card template, building it on first use"""
+    global _template
+    if _template is None:
+        _template = ReportCardTemplate()
+    return _template
+
+
+def build_report_card_elements(context):
+    """Build the flowables for one report card from its context"""
+    return get_report_card_template().build_elements(context)
+
+
+def render_report_card(context):
+    """Render one report card context to PDF bytes"""
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    doc.build(build_report_card_elements(context))
+    return buffer.getvalue()
+
+
+def render_report_cards_merged(contexts, fileobj):
+    """Render several report cards into a single PDF, one card per page"""
+    elements = []
+    for index, context in enumerate(contexts):
+        if index:
+            elements.append(PageBreak())
+        elements.extend(build_report_card_elements(context))
     
-    # Build PDF
+    doc = SimpleDocTemplate(fileobj, pagesize=A4)
     doc.build(elements)
+
+
+def generate_report_card(student, term):
+    """Generate PDF report card for a student"""
+    results = Result.objects.filter(student=student, term=term).select_related('subject')
+    summary = StudentTermSummary.objects.filter(student=student, term=term).first()
+    ranks = get_class_ranks(student.current_class_id, term.id) if student.current_class_id else None
+    context = build_report_card_context(student, term, results, summary, ranks)
+    
+    buffer = BytesIO(render_report_card(context))
     buffer.seek(0)
     return buffer
\ No newline at end of file
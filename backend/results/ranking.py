@@ -0,0 +1,74 @@
+from django.core.cache import cache
+from django.db.models import F, Window
+from django.db.models.functions import Rank
+from .models import Result, StudentTermSummary
+
+
+def _cache_key(class_id, term_id):
+    return f"results:ranks:{class_id}:{term_id}"
+
+
+def compute_class_ranks(class_id, term_id):
+    """
+    Rank every active student of a class for a term, overall and per subject.
+    Both rankings are done by the database with RANK() window functions,
+    one query each for the whole class.
+    """
+    overall = (
+        StudentTermSummary.objects.filter(
+            term_id=term_id,
+            student__current_class_id=class_id,
+            student__is_active=True,
+        )
+        .annotate(position=Window(
+            expression=Rank(),
+            partition_by=[F('student__current_class_id'), F('term_id')],
+            order_by=F('percentage').desc(),
+        ))
+        .values_list('student_id', 'percentage', 'position')
+    )
+    
+    subjects = (
+        Result.objects.filter(
+            term_id=term_id,
+            student__current_class_id=class_id,
+            student__is_active=True,
+        )
+        .annotate(position=Window(
+            expression=Rank(),
+            partition_by=[F('subject_id')],
+            order_by=(F('marks_obtained') * 100 / F('total_marks')).desc(),
+        ))
+        .order_by()
+        .values_list('student_id', 'subject_id', 'position')
+    )
+    
+    students = {
+        student_id: {'position': position, 'percentage': float(percentage), 'subjects': {}}
+        for student_id, percentage, position in overall
+    }
+    subject_sizes = {}
+    for student_id, subject_id, position in subjects:
+        subject_sizes[subject_id] = subject_sizes.get(subject_id, 0) + 1
+        if student_id in students:
+            students[student_id]['subjects'][subject_id] = position
+    
+    return {
+        'class_size': len(students),
+        'subject_sizes': subject_sizes,
+        'students': students,
+    }
+
+
+def get_class_ranks(class_id, term_id):
+    """Class ranks for a term, cached until a result in the class changes"""
+    key = _cache_key(class_id, term_id)
+    ranks = cache.get(key)
+    if ranks is None:
+        ranks = compute_class_ranks(class_id, term_id)
+        cache.set(key, ranks)
+    return ranks
+
+
+def invalidate_class_ranks(class_id, term_id):
+    cache.delete(_cache_key(class_id, term_id))
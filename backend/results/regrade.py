@@ -0,0 +1,64 @@
+from django.db import transaction
+from django.db.models import Case, CharField, F, Q, Value, When
+from django.utils import timezone
+from students.models import Student
+from .analytics import invalidate_term_statistics
+from .grading import get_grading_scale, scale_grade_levels
+from .models import Result, StudentTermSummary
+
+
+def term_grade_case(term):
+    """
+    SQL expression grading a term's results with the scales that apply to
+    them, picked by the grade level of the student's class like the term
+    summaries. UPDATE statements cannot join, so grade levels are matched
+    with a subquery on the student instead of student__current_class__grade_level.
+    """
+    percentage = F('marks_obtained') * 100 / F('total_marks')
+    
+    whens = []
+    for grade_level in scale_grade_levels(term.academic_year_id):
+        condition = Q(student_id__in=Student.objects.filter(current_class__grade_level=grade_level).values('id'))
+        scale = get_grading_scale(term.academic_year_id, grade_level)
+        whens.extend(scale.whens(percentage, condition))
+        whens.append(When(condition, then=Value(scale.lowest_grade)))
+    
+    year_scale = get_grading_scale(term.academic_year_id)
+    if not whens:
+        return year_scale.case(percentage)
+    return Case(*whens, default=year_scale.case(percentage), output_field=CharField())
+
+
+def regrade_term(term):
+    """
+    Recompute the grade of every result in a term with one UPDATE, touching
+    only rows whose grade changes, then rebuild the term's summaries.
+    Returns the number of results regraded.
+    """
+    grade = term_grade_case(term)
+    
+    with transaction.atomic():
+        changed = (
+            Result.objects.filter(term=term)
+            .exclude(grade=grade)
+            .update(grade=grade, updated_at=timezone.now())
+        )
+        StudentTermSummary.rebuild(term_ids=[term.id])
+    
+    # The grade distributions changed with the grades
+    invalidate_term_statistics(term.id)
+    return changed
+
+
+def regrade_terms(terms, progress=None):
+    """
+    Regrade every result in the given terms, one UPDATE per term.
+    ``progress`` is called as ``progress(term, changed)`` after each term.
+    Returns {term_id: results regraded}.
+    """
+    changed = {}
+    for term in terms:
+        changed[term.id] = regrade_term(term)
+        if progress:
+            progress(term, changed[term.id])
+    return changed
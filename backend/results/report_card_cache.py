@@ -0,0 +1,67 @@
+import hashlib
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import Count, Max
+from .grading import grading_scale_version
+from .models import GradingScale, Result, StudentTermSummary
+from .pdf_generator import generate_report_card
+
+CACHE_DIRECTORY = 'report_cards/cache'
+
+
+def _entry_directory(student_id, term_id):
+    return f"{CACHE_DIRECTORY}/{student_id}/{term_id}"
+
+
+def report_card_version(student, term):
+    """
+    Return the (etag, last_modified) pair for a student's report card.
+    The card shows the student's position in class, so it changes whenever
+    a result or term summary in the student's class for the term (or the
+    student's own details) change. The row count catches deleted results.
+    The overall grade and the grading table come from the live grading
+    scales, so their version is part of the ETag too.
+    """
+    if student.current_class_id:
+        students = {'student__current_class_id': student.current_class_id}
+    else:
+        students = {'student': student}
+    
+    freshness = Result.objects.filter(term=term, **students).aggregate(latest=Max('updated_at'), count=Count('id'))
+    # A regrade rewrites overall grades without touching any result
+    summaries_updated = StudentTermSummary.objects.filter(term=term, **students).aggregate(latest=Max('updated_at'))['latest']
+    scales_updated = GradingScale.objects.aggregate(latest=Max('updated_at'))['latest']
+    last_modified = max(filter(None, [freshness['latest'], summaries_updated, scales_updated, student.updated_at]))
+    
+    etag = hashlib.sha1(
+        f"{student.id}:{term.id}:{freshness['count']}:{last_modified.isoformat()}:{grading_scale_version()}".encode()
+    ).hexdigest()
+    return etag, last_modified
+
+
+def get_cached_report_card(student, term, etag):
+    """
+    Return the storage path of the report card for this version,
+    rendering and storing it first if it is not cached yet.
+    """
+    path = f"{_entry_directory(student.id, term.id)}/{etag}.pdf"
+    
+    if not default_storage.exists(path):
+        invalidate_report_card(student.id, term.id)
+        pdf_buffer = generate_report_card(student, term)
+        path = default_storage.save(path, ContentFile(pdf_buffer.getvalue()))
+    
+    return path
+
+
+def invalidate_report_card(student_id, term_id):
+    """Drop every cached report card for a student and term"""
+    directory = _entry_directory(student_id, term_id)
+    
+    try:
+        _, files = default_storage.listdir(directory)
+    except FileNotFoundError:
+        return
+    
+    for name in files:
+        default_storage.delete(f"{directory}/{name}")
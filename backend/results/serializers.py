@@ -1,5 +1,7 @@
 from rest_framework import serializers
-from .models import Term, Result, Attendance, Fee
+from django.conf import settings
+from .models import Term, Result, Attendance, PeriodAttendance, Fee
+from classes.models import Class, ClassSubject
 
 class TermSerializer(serializers.ModelSerializer):
     academic_year_display = serializers.CharField(source='academic_year.year', read_only=True)
@@ -22,6 +24,43 @@ class ResultListSerializer(serializers.ModelSerializer):
                   'percentage', 'grade', 'remarks']
 
 
+class ResultRowSerializer(serializers.Serializer):
+    """
+    Read-only result list rows built from .values() dicts,
+    producing the same output as ResultListSerializer without model instances
+    """
+    # Columns to select with Result.objects.values()
+    value_fields = [
+        'id', 'student_id', 'student__first_name', 'student__last_name',
+        'subject_id', 'subject__name', 'term_id', 'term__term_number',
+        'term__academic_year__year', 'marks_obtained', 'total_marks', 'grade', 'remarks',
+    ]
+    
+    TERM_NAMES = dict(Term.TERM_CHOICES)
+    
+    id = serializers.IntegerField(read_only=True)
+    student = serializers.IntegerField(source='student_id', read_only=True)
+    student_name = serializers.SerializerMethodField()
+    subject = serializers.IntegerField(source='subject_id', read_only=True)
+    subject_name = serializers.CharField(source='subject__name', read_only=True)
+    term = serializers.IntegerField(source='term_id', read_only=True)
+    term_display = serializers.SerializerMethodField()
+    marks_obtained = serializers.DecimalField(max_digits=5, decimal_places=2, read_only=True)
+    total_marks = serializers.DecimalField(max_digits=5, decimal_places=2, read_only=True)
+    percentage = serializers.SerializerMethodField()
+    grade = serializers.CharField(read_only=True)
+    remarks = serializers.CharField(read_only=True)
+    
+    def get_student_name(self, row):
+        return f"{row['student__first_name']} {row['student__last_name']}"
+    
+    def get_term_display(self, row):
+        return f"{self.TERM_NAMES[row['term__term_number']]} - {row['term__academic_year__year']}"
+    
+    def get_percentage(self, row):
+        return (row['marks_obtained'] / row['total_marks']) * 100
+
+
 class ResultDetailSerializer(serializers.ModelSerializer):
     student_name = serializers.CharField(source='student.full_name', read_only=True)
     subject_name = serializers.CharField(source='subject.name', read_only=True)
@@ -47,6 +86,42 @@ class ResultCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class MarksheetEntrySerializer(serializers.Serializer):
+    """
+    One student's marks on a marksheet
+    """
+    student = serializers.IntegerField()
+    marks_obtained = serializers.DecimalField(max_digits=5, decimal_places=2, min_value=0)
+    total_marks = serializers.DecimalField(max_digits=5, decimal_places=2, min_value=1, required=False)
+    remarks = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+
+
+class MarksheetSerializer(serializers.Serializer):
+    """
+    Marks for a whole class in one subject and term.
+    Entries are validated row by row by the view so it can report per-row errors.
+    """
+    class_subject = serializers.PrimaryKeyRelatedField(
+        queryset=ClassSubject.objects.select_related('class_obj', 'subject')
+    )
+    term = serializers.PrimaryKeyRelatedField(queryset=Term.objects.all())
+    total_marks = serializers.DecimalField(max_digits=5, decimal_places=2, min_value=1, default=100)
+    entries = serializers.ListField(child=serializers.DictField(), allow_empty=False)
+
+
+class ResultImportSerializer(serializers.Serializer):
+    """
+    Results spreadsheet upload for a term
+    """
+    file = serializers.FileField()
+    term = serializers.PrimaryKeyRelatedField(queryset=Term.objects.all())
+    
+    def validate_file(self, value):
+        if not value.name.lower().endswith(('.csv', '.xlsx')):
+            raise serializers.ValidationError('Upload a .csv or .xlsx file')
+        return value
+
+
 class StudentResultsSummarySerializer(serializers.Serializer):
     """
     Summary of student results for a specific term
@@ -62,6 +137,20 @@ class StudentResultsSummarySerializer(serializers.Serializer):
     overall_grade = serializers.CharField()
 
 
+class ReportCardBatchSerializer(serializers.Serializer):
+    """
+    Request for a batch of report cards for one class or a whole term
+    """
+    OUTPUT_CHOICES = [
+        ('zip', 'ZIP of individual PDFs'),
+        ('pdf', 'Single merged PDF'),
+    ]
+    
+    term = serializers.PrimaryKeyRelatedField(queryset=Term.objects.all())
+    class_obj = serializers.PrimaryKeyRelatedField(queryset=Class.objects.all(), required=False, allow_null=True)
+    output = serializers.ChoiceField(choices=OUTPUT_CHOICES, default='zip')
+
+
 class AttendanceSerializer(serializers.ModelSerializer):
     student_name = serializers.CharField(source='student.full_name', read_only=True)
     class_name = serializers.CharField(source='class_obj.name', read_only=True)
@@ -84,6 +173,54 @@ class AttendanceCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class RollCallSerializer(serializers.Serializer):
+    """
+    A class register for one day as {student_id: status}.
+    Students of the class left out of the map are marked present.
+    """
+    class_obj = serializers.PrimaryKeyRelatedField(queryset=Class.objects.all())
+    date = serializers.DateField()
+    statuses = serializers.DictField(
+        child=serializers.ChoiceField(choices=Attendance.STATUS_CHOICES),
+        required=False,
+        default=dict
+    )
+    
+    def validate_statuses(self, value):
+        try:
+            return {int(student_id): status for student_id, status in value.items()}
+        except ValueError:
+            raise serializers.ValidationError('Keys must be student ids')
+
+
+class PeriodRollCallSerializer(RollCallSerializer):
+    """
+    A class register for one period of a day
+    """
+    period = serializers.IntegerField(min_value=1)
+    
+    def validate_period(self, value):
+        if value > settings.PERIODS_PER_DAY:
+            raise serializers.ValidationError(f"The school day has {settings.PERIODS_PER_DAY} periods")
+        return value
+
+
+class PeriodAttendanceSerializer(serializers.ModelSerializer):
+    """
+    A student's day of period attendance, expanded to one status per period
+    (null where the period was not marked)
+    """
+    student_name = serializers.CharField(source='student.full_name', read_only=True)
+    periods = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = PeriodAttendance
+        fields = ['id', 'student', 'student_name', 'class_obj', 'date', 'periods', 'updated_at']
+    
+    def get_periods(self, obj):
+        return obj.expand()
+
+
 class FeeSerializer(serializers.ModelSerializer):
     student_name = serializers.CharField(source='student.full_name', read_only=True)
     term_display = serializers.CharField(source='term.__str__', read_only=True)
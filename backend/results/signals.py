@@ -0,0 +1,103 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from students.models import Student
+from .models import (
+    GradingScale,
+    GradeBand,
+    Result,
+    StudentTermSummary,
+    Attendance,
+    ClassDailyAttendance,
+    StudentMonthlyAttendance,
+    ClassMonthlyAttendance,
+)
+from .grading import grading_scales_changed
+from .analytics import invalidate_term_statistics
+from .attendance import invalidate_attendance_calendar
+from .ranking import invalidate_class_ranks
+from .report_card_cache import invalidate_report_card
+
+
+def results_changed(pairs):
+    """
+    Bring everything derived from results up to date after the results of
+    the given (student_id, term_id) pairs were written or deleted.
+    Bulk writes that bypass Result signals call this directly.
+    """
+    pairs = set(pairs)
+    if not pairs:
+        return
+    
+    student_ids = {student_id for student_id, _ in pairs}
+    term_ids = {term_id for _, term_id in pairs}
+    
+    # Cached report cards for these students and terms are stale
+    for student_id, term_id in pairs:
+        invalidate_report_card(student_id, term_id)
+    
+    # Keep the term summaries in step with their results
+    StudentTermSummary.rebuild(student_ids=student_ids, term_ids=term_ids)
+    
+    # Subject statistics of these terms are stale
+    for term_id in term_ids:
+        invalidate_term_statistics(term_id)
+    
+    # Positions in the students' classes need recomputing
+    class_ids = dict(
+        Student.objects.filter(id__in=student_ids).values_list('id', 'current_class_id')
+    )
+    for student_id, term_id in pairs:
+        if class_ids.get(student_id):
+            invalidate_class_ranks(class_ids[student_id], term_id)
+
+
+def attendance_changed(records):
+    """
+    Recount the attendance rollups touched by the given
+    (student_id, class_id, date) records after they were written or deleted.
+    Bulk writes that bypass Attendance signals call this directly.
+    """
+    records = set(records)
+    if not records:
+        return
+    
+    student_ids = {student_id for student_id, _, _ in records}
+    class_ids = {class_id for _, class_id, _ in records}
+    dates = [day for _, _, day in records]
+    start, end = min(dates), max(dates)
+    
+    ClassDailyAttendance.rebuild(owner_ids=class_ids, start=start, end=end)
+    StudentMonthlyAttendance.rebuild(owner_ids=student_ids, start=start, end=end)
+    ClassMonthlyAttendance.rebuild(owner_ids=class_ids, start=start, end=end)
+    
+    # Cached calendar months of these students are stale
+    invalidate_attendance_calendar((student_id, day) for student_id, _, day in records)
+
+
+@receiver(pre_save, sender=Attendance)
+def remember_attendance_key(sender, instance, **kwargs):
+    # An edit can move a record to another day or class; its old rollups need recounting too
+    instance._previous_key = (
+        Attendance.objects.filter(pk=instance.pk).values_list('student_id', 'class_obj_id', 'date').first()
+        if instance.pk else None
+    )
+
+
+@receiver([post_save, post_delete], sender=Attendance)
+def attendance_record_changed(sender, instance, **kwargs):
+    records = [(instance.student_id, instance.class_obj_id, instance.date)]
+    if getattr(instance, '_previous_key', None):
+        records.append(instance._previous_key)
+    attendance_changed(records)
+
+
+@receiver([post_save, post_delete], sender=Result)
+def result_changed(sender, instance, **kwargs):
+    results_changed([(instance.student_id, instance.term_id)])
+
+
+
+@receiver([post_save, post_delete], sender=GradingScale)
+@receiver([post_save, post_delete], sender=GradeBand)
+def grading_scale_changed(sender, instance, **kwargs):
+    grading_scales_changed()
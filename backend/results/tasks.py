@@ -1,10 +1,18 @@
 from celery import shared_task
 from django.core.mail import send_mail
+from django.core.files.storage import default_storage
 from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta
-from .models import Fee, Result
+from .models import Fee, Result, Term, JobWatermark
+from .attendance import absence_streaks
+from .batch_reports import generate_report_card_batch
+from .imports import import_results
+from .regrade import regrade_terms
+from .notifications import send_due_digests, send_absence_alerts, send_fee_reminder_emails
 from students.models import Student
+from classes.models import Class
+from teachers.models import Teacher
 
 @shared_task
 def send_fee_reminder(fee_id):
@@ -49,20 +57,16 @@ School Administration
 
 @shared_task
 def send_fee_reminders():
-    """Send reminders for fees due in next 7 days"""
-    next_week = timezone.now().date() + timedelta(days=7)
-    pending_fees = Fee.objects.filter(
-        status__in=['PENDING', 'PARTIAL'],
-        due_date__lte=next_week,
-        due_date__gte=timezone.now().date()
-    )
-    
-    count = 0
-    for fee in pending_fees:
-        send_fee_reminder.delay(fee.id)
-        count += 1
-    
-    return f"Sent {count} fee reminders"
+    """Send each parent one reminder for their children's fees due in the next 7 days"""
+    sent, fees = send_fee_reminder_emails()
+    return f"Sent {sent} fee reminders covering {fees} fees"
+
+
+@shared_task
+def update_fee_statuses():
+    """Move unpaid fees past their due date to OVERDUE"""
+    changed = Fee.refresh_statuses()
+    return f"Updated {changed} fee statuses"
 
 
 @shared_task
@@ -148,6 +152,36 @@ School Administration
         return f"Error sending notification: {str(e)}"
 
 
+@shared_task
+def send_result_digests():
+    """Send each parent one email listing their children's newly posted results"""
+    sent = send_due_digests()
+    return f"Sent {sent} result digests"
+
+
+@shared_task
+def send_absence_streak_alerts():
+    """
+    Alert parents of students absent ABSENCE_STREAK_DAYS school days in a row.
+    Streaks reaching their n-th day after the previous run's last day, up
+    to yesterday, are looked at; the first run looks back a week. Today is
+    left for the next run so roll calls taken or corrected later in the
+    day are not skipped.
+    """
+    days = settings.ABSENCE_STREAK_DAYS
+    until = timezone.localdate() - timedelta(days=1)
+    watermark = JobWatermark.objects.filter(name='absence-streaks').first()
+    since = watermark.processed_until if watermark else until - timedelta(days=7)
+    if since >= until:
+        return "Absence streaks already checked up to yesterday"
+    
+    streaks = absence_streaks(since, until, days)
+    sent = send_absence_alerts(streaks, days)
+    JobWatermark.objects.update_or_create(name='absence-streaks', defaults={'processed_until': until})
+    
+    return f"Found {len(streaks)} absence streaks, sent {sent} alerts"
+
+
 @shared_task
 def send_bulk_announcement_email(announcement_id):
     """Send announcement via email to relevant users"""
@@ -192,4 +226,76 @@ Published: {announcement.publish_date.strftime('%B %d, %Y')}
         
         return "No recipients found"
     except Exception as e:
-        return f"Error sending announcement: {str(e)}"
\ No newline at end of file
+        return f"Error sending announcement: {str(e)}"
+
+
+@shared_task(bind=True)
+def generate_report_cards(self, term_id, class_id=None, output='zip'):
+    """Render report cards for a class (or every class in the term) into one file"""
+    term = Term.objects.select_related('academic_year').get(id=term_id)
+    
+    if class_id:
+        classes = Class.objects.filter(id=class_id)
+    else:
+        classes = Class.objects.filter(academic_year_id=term.academic_year_id)
+    
+    class_progress = {}
+    
+    def report_progress(class_obj, done, total):
+        class_progress[class_obj.id] = {
+            'class_id': class_obj.id,
+            'class_name': class_obj.name,
+            'done': done,
+            'total': total,
+        }
+        self.update_state(state='PROGRESS', meta={'classes': list(class_progress.values())})
+    
+    relative_path = generate_report_card_batch(term, classes, output=output, progress=report_progress)
+    
+    return {
+        'file': settings.MEDIA_URL + relative_path.replace('\\', '/'),
+        'classes': list(class_progress.values()),
+        'count': sum(entry['done'] for entry in class_progress.values()),
+    }
+
+
+@shared_task(bind=True)
+def import_results_file(self, path, term_id, entered_by_id=None):
+    """Import an uploaded results spreadsheet for a term"""
+    term = Term.objects.get(id=term_id)
+    
+    def report_progress(rows, imported, errors):
+        self.update_state(state='PROGRESS', meta={'rows': rows, 'imported': imported, 'errors': errors})
+    
+    with default_storage.open(path, 'rb') as fileobj:
+        summary = import_results(
+            fileobj,
+            path,
+            term,
+            batch_size=settings.RESULT_IMPORT_BATCH_SIZE,
+            entered_by=Teacher.objects.filter(id=entered_by_id).first() if entered_by_id else None,
+            progress=report_progress,
+        )
+    
+    if summary['error_report']:
+        summary['error_report'] = default_storage.url(summary['error_report'])
+    return summary
+
+
+@shared_task(bind=True)
+def regrade_results(self, term_id=None, academic_year_id=None):
+    """Recompute result grades for a term, an academic year or every term"""
+    terms = Term.objects.select_related('academic_year')
+    if term_id:
+        terms = terms.filter(id=term_id)
+    elif academic_year_id:
+        terms = terms.filter(academic_year_id=academic_year_id)
+    
+    done = {}
+    
+    def report_progress(term, changed):
+        done[str(term)] = changed
+        self.update_state(state='PROGRESS', meta={'terms': done})
+    
+    changed = regrade_terms(terms, progress=report_progress)
+    return {'terms': done, 'regraded': sum(changed.values())}
\ No newline at end of file
@@ -1,3 +1,160 @@
-from django.test import TestCase
+import base64
+import io
+import json
+import tempfile
+from datetime import date
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from accounts.models import User
+from classes.models import AcademicYear, Subject
+from students.models import Student
+from .imports import import_results
+from .models import Term, Result, PendingResultNotification
 
-# Create your tests here.
+
+class ResultListQueryCountTest(TestCase):
+    """The result list must not issue queries per row"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin', 'admin@school.com', 'password', role='ADMIN')
+        parent = User.objects.create_user('parent', 'parent@school.com', 'password', role='PARENT')
+        
+        academic_year = AcademicYear.objects.create(
+            year='2025-2026', start_date=date(2025, 9, 1), end_date=date(2026, 7, 1)
+        )
+        cls.terms = [
+            Term.objects.create(
+                academic_year=academic_year,
+                term_number=number,
+                start_date=date(2025, 9, 1),
+                end_date=date(2025, 12, 15),
+            )
+            for number in ('1', '2')
+        ]
+        cls.subjects = [
+            Subject.objects.create(name=f"Subject {index}", code=f"SUB{index}", grade_level=10)
+            for index in range(5)
+        ]
+        cls.students = [
+            Student.objects.create(
+                parent=parent,
+                first_name="Student",
+                last_name=f"{index}",
+                student_id=f"STU{index:03d}",
+                date_of_birth=date(2010, 1, 1),
+                gender='M',
+                admission_date=date(2020, 1, 1),
+                address='Address',
+                emergency_contact_name='Contact',
+                emergency_contact_phone='0700000000',
+                emergency_contact_relation='Mother',
+            )
+            for index in range(4)
+        ]
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+    
+    def add_results(self, students, terms):
+        Result.objects.bulk_create([
+            Result(student=student, subject=subject, term=term, marks_obtained=65, total_marks=100, grade='B')
+            for student in students
+            for subject in self.subjects
+            for term in terms
+        ])
+    
+    def count_list_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/results/')
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.data['results']
+    
+    def test_query_count_is_constant(self):
+        self.add_results(self.students[:1], self.terms[:1])
+        small_count, small_page = self.count_list_queries()
+        
+        self.add_results(self.students[1:], self.terms)
+        self.add_results(self.students[:1], self.terms[1:])
+        large_count, large_page = self.count_list_queries()
+        
+        self.assertEqual(len(small_page), 5)
+        self.assertEqual(len(large_page), 20)
+        self.assertEqual(small_count, large_count)
+    
+    def test_rows_match_list_serializer(self):
+        self.add_results(self.students[:1], self.terms[:1])
+        _, page = self.count_list_queries()
+        
+        row = page[0]
+        self.assertEqual(row['student_name'], 'Student 0')
+        self.assertEqual(row['subject_name'], 'Subject 0')
+        self.assertEqual(row['term_display'], 'First Term - 2025-2026')
+        self.assertEqual(row['marks_obtained'], '65.00')
+        self.assertEqual(row['percentage'], 65)
+    
+    def test_cursor_with_wrong_key_types_is_not_found(self):
+        self.add_results(self.students[:1], self.terms[:1])
+        cursor = base64.urlsafe_b64encode(json.dumps({'key': ['x', 'y', 'z']}).encode()).decode()
+        
+        response = self.client.get('/api/results/', {'cursor': cursor})
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), RESULT_DIGEST_WINDOW_MINUTES=30)
+class ResultImportTest(TestCase):
+    """Bad rows are reported one by one without stopping the import"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        parent = User.objects.create_user('parent', 'parent@school.com', 'password', role='PARENT')
+        academic_year = AcademicYear.objects.create(
+            year='2025-2026', start_date=date(2025, 9, 1), end_date=date(2026, 7, 1)
+        )
+        cls.term = Term.objects.create(
+            academic_year=academic_year,
+            term_number='1',
+            start_date=date(2025, 9, 1),
+            end_date=date(2025, 12, 15),
+        )
+        Subject.objects.create(name='Mathematics', code='MATH', grade_level=10)
+        for index in range(3):
+            Student.objects.create(
+                parent=parent,
+                first_name='Student',
+                last_name=f"{index}",
+                student_id=f"STU{index:03d}",
+                date_of_birth=date(2010, 1, 1),
+                gender='M',
+                admission_date=date(2020, 1, 1),
+                address='Address',
+                emergency_contact_name='Contact',
+                emergency_contact_phone='0700000000',
+                emergency_contact_relation='Mother',
+            )
+    
+    def test_non_finite_marks_are_rejected_per_row(self):
+        rows = 'student_id,subject_code,marks_obtained\nSTU000,MATH,70\nSTU001,MATH,NaN\nSTU002,MATH,sNaN\n'
+        summary = import_results(io.BytesIO(rows.encode()), 'results.csv', self.term)
+        
+        self.assertEqual(summary['imported'], 1)
+        self.assertEqual(summary['errors'], 2)
+        self.assertEqual(Result.objects.get().student.student_id, 'STU000')
+        with default_storage.open(summary['error_report']) as report:
+            self.assertEqual(len(report.read().decode().splitlines()), 3)
+    
+    def test_only_new_or_changed_results_notify_parents(self):
+        def import_marks(marks):
+            rows = f"student_id,subject_code,marks_obtained\nSTU000,MATH,{marks}\n"
+            import_results(io.BytesIO(rows.encode()), 'results.csv', self.term)
+            queued = PendingResultNotification.objects.count()
+            PendingResultNotification.objects.all().delete()
+            return queued
+        
+        self.assertEqual(import_marks(70), 1)
+        self.assertEqual(import_marks(70), 0)
+        self.assertEqual(import_marks(75), 1)
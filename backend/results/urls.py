@@ -3,19 +3,36 @@ from .views import (
     TermListView,
     TermCreateView,
     ResultListView,
+    ResultExportView,
     ResultDetailView,
     ResultCreateView,
     ResultUpdateView,
+    MarksheetView,
+    ResultImportView,
+    ResultImportStatusView,
     ResultDeleteView,
     StudentResultsSummaryView,
     StudentPerformanceTrendView,
+    MultiStudentPerformanceTrendView,
+    ClassGradebookView,
+    ClassRankingView,
+    TermStatisticsView,
     AttendanceListView,
+    AttendanceExportView,
     AttendanceCreateView,
+    AttendanceRollCallView,
+    AttendanceRateView,
+    AttendanceCalendarView,
+    PeriodAttendanceListView,
+    PeriodRollCallView,
     AttendanceUpdateView,
     FeeListView,
+    FeeExportView,
     FeeCreateView,
     FeeUpdateView,
     DownloadReportCardView,
+    ReportCardBatchView,
+    ReportCardBatchStatusView,
 )
 
 app_name = 'results'
@@ -27,21 +44,38 @@ urlpatterns = [
     
     # Results
     path('', ResultListView.as_view(), name='result_list'),
+    path('export/', ResultExportView.as_view(), name='result_export'),
     path('<int:pk>/', ResultDetailView.as_view(), name='result_detail'),
     path('create/', ResultCreateView.as_view(), name='result_create'),
+    path('marksheet/', MarksheetView.as_view(), name='marksheet'),
+    path('import/', ResultImportView.as_view(), name='result_import'),
+    path('import/<str:task_id>/', ResultImportStatusView.as_view(), name='result_import_status'),
     path('<int:pk>/update/', ResultUpdateView.as_view(), name='result_update'),
     path('<int:pk>/delete/', ResultDeleteView.as_view(), name='result_delete'),
     path('summary/<int:student_id>/<int:term_id>/', StudentResultsSummaryView.as_view(), name='results_summary'),
+    path('trend/', MultiStudentPerformanceTrendView.as_view(), name='performance_trends'),
     path('trend/<int:student_id>/', StudentPerformanceTrendView.as_view(), name='performance_trend'),
+    path('gradebook/<int:class_id>/<int:term_id>/', ClassGradebookView.as_view(), name='class_gradebook'),
+    path('ranks/<int:class_id>/<int:term_id>/', ClassRankingView.as_view(), name='class_ranking'),
+    path('statistics/<int:term_id>/', TermStatisticsView.as_view(), name='term_statistics'),
     path('report-card/<int:student_id>/<int:term_id>/', DownloadReportCardView.as_view(), name='download_report_card'),
+    path('report-card/batch/', ReportCardBatchView.as_view(), name='report_card_batch'),
+    path('report-card/batch/<str:task_id>/', ReportCardBatchStatusView.as_view(), name='report_card_batch_status'),
     
     # Attendance
     path('attendance/', AttendanceListView.as_view(), name='attendance_list'),
+    path('attendance/export/', AttendanceExportView.as_view(), name='attendance_export'),
     path('attendance/create/', AttendanceCreateView.as_view(), name='attendance_create'),
+    path('attendance/roll-call/', AttendanceRollCallView.as_view(), name='attendance_roll_call'),
+    path('attendance/rate/', AttendanceRateView.as_view(), name='attendance_rate'),
+    path('attendance/calendar/<int:student_id>/', AttendanceCalendarView.as_view(), name='attendance_calendar'),
+    path('attendance/periods/', PeriodAttendanceListView.as_view(), name='period_attendance_list'),
+    path('attendance/periods/roll-call/', PeriodRollCallView.as_view(), name='period_roll_call'),
     path('attendance/<int:pk>/update/', AttendanceUpdateView.as_view(), name='attendance_update'),
     
     # Fees
     path('fees/', FeeListView.as_view(), name='fee_list'),
+    path('fees/export/', FeeExportView.as_view(), name='fee_export'),
     path('fees/create/', FeeCreateView.as_view(), name='fee_create'),
     path('fees/<int:pk>/update/', FeeUpdateView.as_view(), name='fee_update'),
 ]
\ No newline at end of file
@@ -1,22 +1,55 @@
+from datetime import date, datetime
+from uuid import uuid4
 from rest_framework import generics, permissions, status
 from rest_framework.views import APIView
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
-from django.db.models import Sum, Avg
-from django.http import HttpResponse
-from .models import Term, Result, Attendance, Fee
-from .pdf_generator import generate_report_card
+from django.db.models import Sum, Avg, F, FloatField
+from django.db.models.functions import Cast, Round
+from django.conf import settings
+from django.http import FileResponse
+from django.core.files.storage import default_storage
+from django.utils.cache import get_conditional_response
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.utils.http import http_date, quote_etag
+from celery.result import AsyncResult
+from .models import Term, Result, StudentTermSummary, Attendance, PeriodAttendance, Fee, QueuedTask
+from .bulk import build_result, upsert_results, upsert_attendance
+from .exports import CSVExportMixin
+from .pagination import KeysetOrPageNumberPagination
+from .analytics import get_term_statistics
+from .attendance import CALENDAR_CODES, attendance_calendar, attendance_rate, mark_period
+from .gradebook import build_gradebook
+from .grading import get_grading_scale, grading_scale_version, grade_case
+from .notifications import notify_parents
+from .ranking import get_class_ranks
+from .report_card_cache import report_card_version, get_cached_report_card
 from .serializers import (
     TermSerializer,
     ResultListSerializer,
+    ResultRowSerializer,
     ResultDetailSerializer,
     ResultCreateSerializer,
     StudentResultsSummarySerializer,
+    ReportCardBatchSerializer,
+    MarksheetSerializer,
+    MarksheetEntrySerializer,
+    RollCallSerializer,
+    PeriodRollCallSerializer,
+    ResultImportSerializer,
     AttendanceSerializer,
     AttendanceCreateSerializer,
+    PeriodAttendanceSerializer,
     FeeSerializer,
     FeeCreateSerializer
 )
+from .imports import IMPORT_DIRECTORY
+from .tasks import generate_report_cards, import_results_file
 from students.models import Student
+from school_system.conditional import conditional_get
+from classes.models import Class
 
 class IsTeacherOrAdmin(permissions.BasePermission):
     def has_permission(self, request, view):
@@ -44,11 +77,22 @@ class TermCreateView(generics.CreateAPIView):
 
 # Result Views
 class ResultListView(generics.ListAPIView):
+    """
+    List results, newest term first.
+    Pages are read with .values() and ResultRowSerializer, so a page costs
+    the same two queries (count and rows) whatever its size.
+    Pass ?cursor= for keyset pages, which skip the count and OFFSET.
+    """
     serializer_class = ResultListSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetOrPageNumberPagination
+    
+    # Matches the (-term, student, subject) index, no join on Term needed
+    ordering = ['-term_id', 'student_id', 'subject_id']
+    keyset_ordering = ordering
     
     def get_queryset(self):
-        queryset = Result.objects.all()
+        queryset = Result.objects.select_related('student', 'subject', 'term__academic_year').order_by(*self.ordering)
         
         # Filter by student if provided
         student_id = self.request.query_params.get('student', None)
@@ -66,6 +110,36 @@ class ResultListView(generics.ListAPIView):
             queryset = queryset.filter(student_id__in=children_ids)
         
         return queryset
+    
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset()).values(*ResultRowSerializer.value_fields)
+        
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(ResultRowSerializer(page, many=True).data)
+        
+        return Response(ResultRowSerializer(queryset, many=True).data)
+
+
+class ResultExportView(CSVExportMixin, ResultListView):
+    """
+    Stream results as CSV, with the same filters as the result list
+    """
+    export_filename = 'results'
+    export_ordering = ['term_id', 'student_id', 'subject_id']
+    export_columns = [
+        ('Student ID', 'student__student_id'),
+        ('First Name', 'student__first_name'),
+        ('Last Name', 'student__last_name'),
+        ('Subject Code', 'subject__code'),
+        ('Subject', 'subject__name'),
+        ('Academic Year', 'term__academic_year__year'),
+        ('Term', 'term__term_number'),
+        ('Marks Obtained', 'marks_obtained'),
+        ('Total Marks', 'total_marks'),
+        ('Grade', 'grade'),
+        ('Remarks', 'remarks'),
+    ]
 
 
 class ResultDetailView(generics.RetrieveAPIView):
@@ -78,6 +152,84 @@ class ResultCreateView(generics.CreateAPIView):
     queryset = Result.objects.all()
     serializer_class = ResultCreateSerializer
     permission_classes = [IsTeacherOrAdmin]
+    
+    def perform_create(self, serializer):
+        result = serializer.save()
+        notify_parents([result])
+
+
+class MarksheetView(APIView):
+    """
+    Enter or update a whole class's marks for one subject and term.
+    Valid rows are written in one upsert; invalid rows are reported per row.
+    """
+    permission_classes = [IsTeacherOrAdmin]
+    
+    def post(self, request):
+        serializer = MarksheetSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        class_subject = serializer.validated_data['class_subject']
+        term = serializer.validated_data['term']
+        default_total = serializer.validated_data['total_marks']
+        entered_by = getattr(request.user, 'teacher_profile', None)
+        scale = get_grading_scale(term.academic_year_id, class_subject.class_obj.grade_level)
+        
+        rows = []
+        errors = []
+        for index, entry in enumerate(serializer.validated_data['entries']):
+            entry_serializer = MarksheetEntrySerializer(data=entry)
+            if entry_serializer.is_valid():
+                rows.append((index, entry_serializer.validated_data))
+            else:
+                errors.append({'row': index, 'student': entry.get('student'), 'errors': entry_serializer.errors})
+        
+        # One query to check every student belongs to the class
+        class_students = set(
+            Student.objects.filter(
+                current_class_id=class_subject.class_obj_id,
+                is_active=True,
+                id__in=[row['student'] for _, row in rows],
+            ).values_list('id', flat=True)
+        )
+        
+        results = []
+        seen = set()
+        for index, row in rows:
+            total_marks = row.get('total_marks', default_total)
+            row_errors = {}
+            
+            if row['student'] not in class_students:
+                row_errors['student'] = ['Student is not in this class']
+            elif row['student'] in seen:
+                row_errors['student'] = ['Student appears more than once']
+            if row['marks_obtained'] > total_marks:
+                row_errors['marks_obtained'] = ['Marks obtained cannot exceed total marks']
+            
+            if row_errors:
+                errors.append({'row': index, 'student': row['student'], 'errors': row_errors})
+                continue
+            
+            seen.add(row['student'])
+            results.append(build_result(
+                row['student'],
+                class_subject.subject_id,
+                term.id,
+                row['marks_obtained'],
+                total_marks,
+                scale,
+                remarks=row.get('remarks'),
+                entered_by=entered_by,
+            ))
+        
+        if results:
+            notify_parents(upsert_results(results))
+        
+        errors.sort(key=lambda error: error['row'])
+        return Response(
+            {'saved': len(results), 'errors': errors},
+            status=status.HTTP_200_OK if results or not errors else status.HTTP_400_BAD_REQUEST
+        )
 
 
 class ResultUpdateView(generics.UpdateAPIView):
@@ -91,23 +243,46 @@ class ResultDeleteView(generics.DestroyAPIView):
     permission_classes = [IsAdminUser]
 
 
+def visible_students(user):
+    """Students whose results the user may view"""
+    if user.is_parent:
+        # Parents can only view their children
+        return Student.objects.filter(parent=user, is_active=True)
+    # Admin/Teachers can view any student
+    return Student.objects.all()
+
+
 class StudentResultsSummaryView(APIView):
     """
-    Get comprehensive results summary for a student in a specific term
+    Get comprehensive results summary for a student in a specific term.
+    Supports conditional requests (ETag / If-None-Match).
     """
     permission_classes = [permissions.IsAuthenticated]
     
+    def get_validators(self, request, student_id, term_id):
+        student = visible_students(request.user).filter(id=student_id).values('updated_at', 'current_class_id').first()
+        if student is None or not Term.objects.filter(id=term_id).exists():
+            return None
+        
+        # Class position and subject ranks change with any result or summary in the class
+        if student['current_class_id']:
+            students = {'student__current_class_id': student['current_class_id']}
+        else:
+            students = {'student_id': student_id}
+        # A regrade can rewrite overall grades without touching any result
+        return [
+            student['updated_at'],
+            Result.objects.filter(term_id=term_id, **students),
+            StudentTermSummary.objects.filter(term_id=term_id, **students),
+            grading_scale_version(),
+        ]
+    
+    @conditional_get
     def get(self, request, student_id, term_id):
         # Check permissions and get student
         try:
-            if request.user.is_parent:
-                # Parents can only view their children
-                student = Student.objects.get(id=student_id, parent=request.user, is_active=True)
-            else:
-                # Admin/Teachers can view any student
-                student = Student.objects.get(id=student_id)
-            
-            term = Term.objects.get(id=term_id)
+            student = visible_students(request.user).get(id=student_id)
+            term = Term.objects.select_related('academic_year').get(id=term_id)
         except Student.DoesNotExist:
             if request.user.is_parent:
                 return Response(
@@ -124,43 +299,33 @@ class StudentResultsSummaryView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Get all results for this student and term
-        results = Result.objects.filter(student=student, term=term)
-        
-        # Calculate totals (handle empty results case)
-        total_marks_obtained = results.aggregate(Sum('marks_obtained'))['marks_obtained__sum'] or 0
-        total_marks_possible = results.aggregate(Sum('total_marks'))['total_marks__sum'] or 0
-        overall_percentage = (total_marks_obtained / total_marks_possible * 100) if total_marks_possible > 0 else 0
-        
-        # Calculate overall grade
-        if total_marks_possible == 0:
-            overall_grade = None
-        elif overall_percentage >= 90:
-            overall_grade = 'A+'
-        elif overall_percentage >= 80:
-            overall_grade = 'A'
-        elif overall_percentage >= 70:
-            overall_grade = 'B+'
-        elif overall_percentage >= 60:
-            overall_grade = 'B'
-        elif overall_percentage >= 50:
-            overall_grade = 'C'
-        elif overall_percentage >= 40:
-            overall_grade = 'D'
-        else:
-            overall_grade = 'F'
+        # Totals come from the maintained summary row
+        summary = StudentTermSummary.objects.filter(student=student, term=term).first()
+        if summary is None:
+            summary = StudentTermSummary.refresh(student.id, term.id)
+        
+        results = Result.objects.filter(student=student, term=term).select_related(
+            'student', 'subject', 'term__academic_year'
+        )
+        
+        # Position in class and per-subject ranks
+        ranks = get_class_ranks(student.current_class_id, term.id) if student.current_class_id else None
+        student_ranks = ranks['students'].get(student.id) if ranks else None
         
         data = {
             'student_id': student.id,
             'student_name': student.full_name,
             'term_id': term.id,
             'term_display': str(term),
-            'results': ResultListSerializer(results, many=True).data,
-            'total_marks_obtained': float(total_marks_obtained),
-            'total_marks_possible': float(total_marks_possible),
-            'overall_percentage': round(overall_percentage, 2),
-            'overall_grade': overall_grade,
-            'has_results': results.exists(),
+            'results': ResultListSerializer(results, many=True).data if summary else [],
+            'total_marks_obtained': float(summary.total_marks_obtained) if summary else 0.0,
+            'total_marks_possible': float(summary.total_marks_possible) if summary else 0.0,
+            'overall_percentage': float(summary.percentage) if summary else 0,
+            'overall_grade': summary.overall_grade if summary else None,
+            'has_results': summary is not None,
+            'class_position': student_ranks['position'] if student_ranks else None,
+            'class_size': ranks['class_size'] if ranks else None,
+            'subject_ranks': student_ranks['subjects'] if student_ranks else {},
         }
         
         return Response(data)
@@ -168,19 +333,23 @@ class StudentResultsSummaryView(APIView):
 
 class StudentPerformanceTrendView(APIView):
     """
-    Get student performance across all terms (for trend analysis)
+    Get student performance across all terms (for trend analysis).
+    Supports conditional requests (ETag / If-None-Match).
     """
     permission_classes = [permissions.IsAuthenticated]
     
+    def get_validators(self, request, student_id):
+        student = visible_students(request.user).filter(id=student_id).values('updated_at').first()
+        if student is None:
+            return None
+        # Overall grades are graded with the current grading scales
+        return [student['updated_at'], Result.objects.filter(student_id=student_id), grading_scale_version()]
+    
+    @conditional_get
     def get(self, request, student_id):
         # Check permissions and get student
         try:
-            if request.user.is_parent:
-                # Parents can only view their children
-                student = Student.objects.get(id=student_id, parent=request.user, is_active=True)
-            else:
-                # Admin/Teachers can view any student
-                student = Student.objects.get(id=student_id)
+            student = visible_students(request.user).get(id=student_id)
         except Student.DoesNotExist:
             if request.user.is_parent:
                 return Response(
@@ -192,62 +361,217 @@ class StudentPerformanceTrendView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Get all terms that have results for this student
-        terms_with_results = Term.objects.filter(
-            results__student=student
-        ).distinct().order_by('start_date', 'term_number')
+        return Response({
+            'student_id': student.id,
+            'student_name': student.full_name,
+            'performance_trend': performance_trends([student.id])[student.id]
+        })
+
+
+class ClassGradebookView(APIView):
+    """
+    Students x subjects grid of marks and grades for a class in a term,
+    with row totals and subject averages, in a columnar layout
+    """
+    permission_classes = [IsTeacherOrAdmin]
+    
+    def get(self, request, class_id, term_id):
+        try:
+            class_obj = Class.objects.get(id=class_id)
+            term = Term.objects.select_related('academic_year').get(id=term_id)
+        except (Class.DoesNotExist, Term.DoesNotExist):
+            return Response(
+                {'error': 'Class or Term not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        return Response(build_gradebook(class_obj, term))
+
+
+class TermStatisticsView(APIView):
+    """
+    Mean, median, standard deviation, pass rate, percentiles and grade
+    distribution per class and subject for a term (?class= for one class)
+    """
+    permission_classes = [IsTeacherOrAdmin]
+    
+    def get(self, request, term_id):
+        if not Term.objects.filter(id=term_id).exists():
+            return Response(
+                {'error': 'Term not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        statistics = get_term_statistics(term_id)
         
-        performance_data = []
+        class_id = request.query_params.get('class', None)
+        if class_id:
+            statistics = {
+                **statistics,
+                'classes': [entry for entry in statistics['classes'] if str(entry['class_id']) == class_id],
+            }
         
-        for term in terms_with_results:
-            results = Result.objects.filter(student=student, term=term)
-            
-            if results.exists():
-                total_marks_obtained = results.aggregate(Sum('marks_obtained'))['marks_obtained__sum'] or 0
-                total_marks_possible = results.aggregate(Sum('total_marks'))['total_marks__sum'] or 0
-                overall_percentage = (total_marks_obtained / total_marks_possible * 100) if total_marks_possible > 0 else 0
-                
-                # Calculate overall grade
-                if overall_percentage >= 90:
-                    overall_grade = 'A+'
-                elif overall_percentage >= 80:
-                    overall_grade = 'A'
-                elif overall_percentage >= 70:
-                    overall_grade = 'B+'
-                elif overall_percentage >= 60:
-                    overall_grade = 'B'
-                elif overall_percentage >= 50:
-                    overall_grade = 'C'
-                elif overall_percentage >= 40:
-                    overall_grade = 'D'
-                else:
-                    overall_grade = 'F'
-                
-                performance_data.append({
-                    'term_id': term.id,
-                    'term_display': str(term),
-                    'term_number': term.term_number,
-                    'academic_year': term.academic_year.year,
-                    'overall_percentage': round(overall_percentage, 2),
-                    'overall_grade': overall_grade,
-                    'total_marks_obtained': float(total_marks_obtained),
-                    'total_marks_possible': float(total_marks_possible),
-                })
+        return Response(statistics)
+
+
+class ClassRankingView(APIView):
+    """
+    Position in class and per-subject ranks for every student of a class in a term
+    """
+    permission_classes = [IsTeacherOrAdmin]
+    
+    def get(self, request, class_id, term_id):
+        if not Class.objects.filter(id=class_id).exists() or not Term.objects.filter(id=term_id).exists():
+            return Response(
+                {'error': 'Class or Term not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        ranks = get_class_ranks(class_id, term_id)
+        names = {
+            student.id: student.full_name
+            for student in Student.objects.filter(id__in=ranks['students']).only('id', 'first_name', 'last_name')
+        }
+        
+        rankings = sorted(
+            (
+                {
+                    'student_id': student_id,
+                    'student_name': names.get(student_id),
+                    'position': entry['position'],
+                    'percentage': entry['percentage'],
+                    'subject_ranks': entry['subjects'],
+                }
+                for student_id, entry in ranks['students'].items()
+            ),
+            key=lambda entry: entry['position']
+        )
         
         return Response({
-            'student_id': student.id,
-            'student_name': student.full_name,
-            'performance_trend': performance_data
+            'class_id': class_id,
+            'term_id': term_id,
+            'class_size': ranks['class_size'],
+            'subject_sizes': ranks['subject_sizes'],
+            'rankings': rankings,
+        })
+
+
+def performance_trends(student_ids):
+    """
+    Per-term totals for each student, ordered by term.
+    Uses one grouped aggregation over results, graded by the database,
+    and one query for the terms.
+    """
+    overall_percentage = Round(Cast(Sum('marks_obtained'), FloatField()) * 100 / Cast(Sum('total_marks'), FloatField()), 2)
+    totals = list(
+        Result.objects.filter(student_id__in=student_ids)
+        .order_by()
+        .values('student_id', 'term_id', 'term__academic_year_id', 'student__current_class__grade_level')
+        .annotate(
+            total_marks_obtained=Sum('marks_obtained'),
+            total_marks_possible=Sum('total_marks'),
+            overall_percentage=overall_percentage,
+            overall_grade=grade_case(
+                overall_percentage,
+                year_field='term__academic_year_id',
+                level_field='student__current_class__grade_level',
+            ),
+        )
+    )
+    
+    terms = Term.objects.filter(
+        id__in={row['term_id'] for row in totals}
+    ).select_related('academic_year').order_by('start_date', 'term_number')
+    term_order = {term.id: (position, term) for position, term in enumerate(terms)}
+    
+    trends = {student_id: [] for student_id in student_ids}
+    for row in sorted(totals, key=lambda row: term_order[row['term_id']][0]):
+        term = term_order[row['term_id']][1]
+        trends[row['student_id']].append({
+            'term_id': term.id,
+            'term_display': str(term),
+            'term_number': term.term_number,
+            'academic_year': term.academic_year.year,
+            'overall_percentage': float(row['overall_percentage']),
+            'overall_grade': row['overall_grade'],
+            'total_marks_obtained': float(row['total_marks_obtained']),
+            'total_marks_possible': float(row['total_marks_possible']),
+        })
+    
+    return trends
+
+
+class MultiStudentPerformanceTrendView(APIView):
+    """
+    Get performance trends for several students in one request
+    - Parents: their children (all of them by default)
+    - Admin/Teachers: students given by ?students=1,2,3 or a whole ?class=
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        student_ids = request.query_params.get('students', None)
+        class_id = request.query_params.get('class', None)
+        
+        if request.user.is_parent:
+            students = Student.objects.filter(parent=request.user, is_active=True)
+        elif student_ids or class_id:
+            students = Student.objects.all()
+        else:
+            return Response(
+                {'error': 'Provide students or class'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if student_ids:
+            try:
+                student_ids = [int(student_id) for student_id in student_ids.split(',')]
+            except ValueError:
+                return Response(
+                    {'error': 'students must be a comma-separated list of ids'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            students = students.filter(id__in=student_ids)
+        
+        if class_id:
+            if not class_id.isdigit():
+                return Response(
+                    {'error': 'class must be an id'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            students = students.filter(current_class_id=int(class_id), is_active=True)
+        
+        students = list(students.only('id', 'first_name', 'last_name'))
+        trends = performance_trends([student.id for student in students])
+        
+        return Response({
+            'students': [
+                {
+                    'student_id': student.id,
+                    'student_name': student.full_name,
+                    'performance_trend': trends[student.id],
+                }
+                for student in students
+            ]
         })
 
 
 # Attendance Views
 class AttendanceListView(generics.ListAPIView):
+    """
+    List attendance, newest first.
+    Pass ?cursor= for keyset pages, which skip the count and OFFSET.
+    """
     serializer_class = AttendanceSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetOrPageNumberPagination
+    
+    # Matches the (-date, student, id) index
+    ordering = ['-date', 'student_id', 'id']
+    keyset_ordering = ordering
     
     def get_queryset(self):
-        queryset = Attendance.objects.all()
+        queryset = Attendance.objects.select_related('student', 'class_obj', 'marked_by').order_by(*self.ordering)
         
         # Filter by student
         student_id = self.request.query_params.get('student', None)
@@ -267,12 +591,218 @@ class AttendanceListView(generics.ListAPIView):
         return queryset
 
 
+class AttendanceExportView(CSVExportMixin, AttendanceListView):
+    """
+    Stream attendance as CSV, with the same filters as the attendance list
+    """
+    export_filename = 'attendance'
+    export_ordering = ['date', 'student_id']
+    export_columns = [
+        ('Date', 'date'),
+        ('Student ID', 'student__student_id'),
+        ('First Name', 'student__first_name'),
+        ('Last Name', 'student__last_name'),
+        ('Class', 'class_obj__name'),
+        ('Status', 'status'),
+        ('Remarks', 'remarks'),
+        ('Marked By (First Name)', 'marked_by__first_name'),
+        ('Marked By (Last Name)', 'marked_by__last_name'),
+    ]
+
+
 class AttendanceCreateView(generics.CreateAPIView):
     queryset = Attendance.objects.all()
     serializer_class = AttendanceCreateSerializer
     permission_classes = [IsTeacherOrAdmin]
 
 
+class AttendanceRollCallView(APIView):
+    """
+    Mark a whole class's attendance for one day in a single upsert.
+    Students of the class who are not listed are marked present.
+    """
+    permission_classes = [IsTeacherOrAdmin]
+    serializer_class = RollCallSerializer
+    
+    def post(self, request):
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        statuses = serializer.validated_data['statuses']
+        
+        # One query for the class register
+        class_students = list(
+            Student.objects.filter(current_class=serializer.validated_data['class_obj'], is_active=True).values_list('id', flat=True)
+        )
+        
+        not_in_class = sorted(set(statuses) - set(class_students))
+        if not_in_class:
+            return Response(
+                {'statuses': {student_id: ['Student is not in this class'] for student_id in not_in_class}},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        saved = self.save(serializer.validated_data, class_students)
+        
+        return Response({
+            'saved': saved,
+            'defaulted_present': saved - len(statuses),
+        })
+    
+    def save(self, data, class_students):
+        """Write the register for every student of the class, returns the rows written"""
+        marked_by = getattr(self.request.user, 'teacher_profile', None)
+        records = [
+            Attendance(
+                student_id=student_id,
+                class_obj=data['class_obj'],
+                date=data['date'],
+                status=data['statuses'].get(student_id, 'P'),
+                marked_by=marked_by,
+            )
+            for student_id in class_students
+        ]
+        return upsert_attendance(records)
+
+
+class PeriodRollCallView(AttendanceRollCallView):
+    """
+    Mark a whole class's attendance for one period of a day.
+    Students of the class who are not listed are marked present.
+    """
+    serializer_class = PeriodRollCallSerializer
+    
+    def save(self, data, class_students):
+        return mark_period(data['class_obj'], data['date'], data['period'], data['statuses'], class_students)
+
+
+class PeriodAttendanceListView(generics.ListAPIView):
+    """
+    Period attendance, one row per student and day with the periods expanded
+    (?student=, ?class=, ?date=, and ?period=&status= for one period's status)
+    """
+    serializer_class = PeriodAttendanceSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        queryset = PeriodAttendance.objects.select_related('student')
+        params = self.request.query_params
+        
+        if params.get('student'):
+            queryset = queryset.filter(student_id=params['student'])
+        if params.get('class'):
+            queryset = queryset.filter(class_obj_id=params['class'])
+        if params.get('date'):
+            queryset = queryset.filter(date=params['date'])
+        
+        status_code = params.get('status')
+        if status_code:
+            if status_code not in dict(Attendance.STATUS_CHOICES):
+                raise ValidationError({'status': f"Must be one of {', '.join(dict(Attendance.STATUS_CHOICES))}"})
+            period = params.get('period')
+            if period and period.isdigit():
+                if not 1 <= int(period) <= settings.PERIODS_PER_DAY:
+                    raise ValidationError({'period': f"The school day has {settings.PERIODS_PER_DAY} periods"})
+                queryset = queryset.with_status(int(period), status_code)
+            else:
+                queryset = queryset.with_any_status(status_code)
+        
+        # Parents can only see their children's attendance
+        if self.request.user.is_parent:
+            children_ids = self.request.user.children.values_list('id', flat=True)
+            queryset = queryset.filter(student_id__in=children_ids)
+        
+        return queryset
+
+
+class AttendanceRateView(APIView):
+    """
+    Attendance counts and rate between two dates, in total and per month,
+    for a ?student= or a ?class= (?start=YYYY-MM-DD&end=YYYY-MM-DD).
+    Read from the attendance rollups. Parents can only query their children.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        student_id = request.query_params.get('student', None)
+        class_id = request.query_params.get('class', None)
+        if bool(student_id) == bool(class_id):
+            return Response(
+                {'error': 'Provide either student or class'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            start = parse_date(request.query_params.get('start', ''))
+            end = parse_date(request.query_params.get('end', ''))
+            owner_id = int(student_id or class_id)
+        except ValueError:
+            start = end = None
+        if not start or not end or start > end:
+            return Response(
+                {'error': 'Provide valid ids and a start and end date (YYYY-MM-DD), start first'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if request.user.is_parent:
+            if class_id or not request.user.children.filter(id=owner_id, is_active=True).exists():
+                return Response(
+                    {'error': 'You can only view your children\'s attendance'},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+        
+        return Response(attendance_rate('student' if student_id else 'class', owner_id, start, end))
+
+
+class AttendanceCalendarView(APIView):
+    """
+    A student's attendance calendar, one packed 2-bit-per-day bitmap per
+    month (?start=YYYY-MM&end=YYYY-MM, the last 12 months by default)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    max_months = 36
+    
+    def get(self, request, student_id):
+        if not visible_students(request.user).filter(id=student_id).exists():
+            if request.user.is_parent:
+                return Response(
+                    {'error': 'You can only view your children\'s attendance'},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+            return Response(
+                {'error': 'Student not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        try:
+            end = request.query_params.get('end', None)
+            end = datetime.strptime(end, '%Y-%m').date() if end else timezone.localdate().replace(day=1)
+            start = request.query_params.get('start', None)
+            if start:
+                start = datetime.strptime(start, '%Y-%m').date()
+            else:
+                months = end.year * 12 + end.month - 12
+                start = date(months // 12, months % 12 + 1, 1)
+        except ValueError:
+            return Response(
+                {'error': 'start and end must be months (YYYY-MM)'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        span = (end.year - start.year) * 12 + end.month - start.month
+        if not 0 <= span < self.max_months:
+            return Response(
+                {'error': f"end must be within {self.max_months} months after start"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return Response({
+            'student_id': student_id,
+            'codes': CALENDAR_CODES,
+            'months': attendance_calendar(student_id, start, end),
+        })
+
+
 class AttendanceUpdateView(generics.UpdateAPIView):
     queryset = Attendance.objects.all()
     serializer_class = AttendanceCreateSerializer
@@ -281,9 +811,19 @@ class AttendanceUpdateView(generics.UpdateAPIView):
 
 # Fee Views
 class FeeListView(generics.ListAPIView):
+    """
+    List fees, supports conditional requests (ETag / If-None-Match)
+    """
     serializer_class = FeeSerializer
     permission_classes = [permissions.IsAuthenticated]
     
+    def get_validators(self, request, *args, **kwargs):
+        return [self.filter_queryset(self.get_queryset())]
+    
+    @conditional_get
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+    
     def get_queryset(self):
         queryset = Fee.objects.all()
         
@@ -300,6 +840,30 @@ class FeeListView(generics.ListAPIView):
         return queryset
 
 
+class FeeExportView(CSVExportMixin, FeeListView):
+    """
+    Stream fees as CSV, with the same filters as the fee list
+    """
+    export_filename = 'fees'
+    export_ordering = ['due_date', 'id']
+    export_columns = [
+        ('Student ID', 'student__student_id'),
+        ('First Name', 'student__first_name'),
+        ('Last Name', 'student__last_name'),
+        ('Academic Year', 'term__academic_year__year'),
+        ('Term', 'term__term_number'),
+        ('Amount', 'amount'),
+        ('Amount Paid', 'amount_paid'),
+        ('Balance', 'balance_due'),
+        ('Status', 'status'),
+        ('Due Date', 'due_date'),
+        ('Description', 'description'),
+    ]
+    
+    def get_export_queryset(self):
+        return super().get_export_queryset().annotate(balance_due=F('amount') - F('amount_paid'))
+
+
 class FeeCreateView(generics.CreateAPIView):
     queryset = Fee.objects.all()
     serializer_class = FeeCreateSerializer
@@ -315,6 +879,7 @@ class FeeUpdateView(generics.UpdateAPIView):
 class DownloadReportCardView(APIView):
     """
     Download PDF report card for a student
+    Cards are cached per result version and support conditional requests
     """
     permission_classes = [permissions.IsAuthenticated]
     
@@ -328,20 +893,126 @@ class DownloadReportCardView(APIView):
                 )
         
         try:
-            student = Student.objects.get(id=student_id)
-            term = Term.objects.get(id=term_id)
+            student = Student.objects.select_related('current_class').get(id=student_id)
+            term = Term.objects.select_related('academic_year').get(id=term_id)
         except (Student.DoesNotExist, Term.DoesNotExist):
             return Response(
                 {'error': 'Student or Term not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Generate PDF
-        pdf_buffer = generate_report_card(student, term)
+        etag, last_modified = report_card_version(student, term)
+        quoted_etag = quote_etag(etag)
+        
+        # Answer If-None-Match / If-Modified-Since without touching the PDF
+        not_modified = get_conditional_response(
+            request,
+            etag=quoted_etag,
+            last_modified=int(last_modified.timestamp())
+        )
+        if not_modified is not None:
+            return not_modified
+        
+        path = get_cached_report_card(student, term, etag)
         
         # Create response
-        response = HttpResponse(pdf_buffer, content_type='application/pdf')
         filename = f"Report_Card_{student.student_id}_{term.academic_year.year}_Term{term.term_number}.pdf"
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        response = FileResponse(
+            default_storage.open(path, 'rb'),
+            as_attachment=True,
+            filename=filename,
+            content_type='application/pdf'
+        )
+        response['ETag'] = quoted_etag
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+        
+        return response
+
+
+class ReportCardBatchView(APIView):
+    """
+    Queue report card generation for a whole class or term
+    """
+    permission_classes = [IsTeacherOrAdmin]
+    
+    def post(self, request):
+        serializer = ReportCardBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
         
-        return response
\ No newline at end of file
+        class_obj = serializer.validated_data.get('class_obj')
+        task = generate_report_cards.delay(
+            serializer.validated_data['term'].id,
+            class_obj.id if class_obj else None,
+            serializer.validated_data['output'],
+        )
+        QueuedTask.objects.create(task_id=task.id, kind='REPORT_CARDS', user=request.user)
+        
+        return Response({'task_id': task.id}, status=status.HTTP_202_ACCEPTED)
+
+
+class TaskStatusView(APIView):
+    """
+    Progress and result of a background task of ``task_kind``,
+    visible only to the user who queued it
+    """
+    permission_classes = [IsTeacherOrAdmin]
+    task_kind = None
+    
+    def get(self, request, task_id):
+        if not QueuedTask.objects.filter(task_id=task_id, kind=self.task_kind, user=request.user).exists():
+            return Response(
+                {'error': 'Task not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        task = AsyncResult(task_id)
+        data = {'task_id': task_id, 'state': task.state}
+        
+        if task.state == 'PROGRESS':
+            data['progress'] = task.info
+        elif task.successful():
+            data['result'] = task.result
+        elif task.failed():
+            data['error'] = str(task.result)
+        
+        return Response(data)
+
+
+class ReportCardBatchStatusView(TaskStatusView):
+    """
+    Progress and download link of a queued report card batch
+    """
+    task_kind = 'REPORT_CARDS'
+
+
+class ResultImportView(APIView):
+    """
+    Upload a results spreadsheet (CSV or XLSX) and import it in the background
+    """
+    permission_classes = [IsTeacherOrAdmin]
+    parser_classes = [MultiPartParser]
+    
+    def post(self, request):
+        serializer = ResultImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        upload = serializer.validated_data['file']
+        # A random directory keeps uploaded marks from being found in MEDIA
+        path = default_storage.save(f"{IMPORT_DIRECTORY}/{uuid4().hex}/{upload.name}", upload)
+        teacher = getattr(request.user, 'teacher_profile', None)
+        
+        task = import_results_file.delay(
+            path,
+            serializer.validated_data['term'].id,
+            teacher.id if teacher else None,
+        )
+        QueuedTask.objects.create(task_id=task.id, kind='RESULT_IMPORT', user=request.user)
+        
+        return Response({'task_id': task.id}, status=status.HTTP_202_ACCEPTED)
+
+
+class ResultImportStatusView(TaskStatusView):
+    """
+    Progress of a results import, with a link to its error report once done
+    """
+    task_kind = 'RESULT_IMPORT'
\ No newline at end of file
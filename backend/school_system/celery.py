@@ -10,6 +10,10 @@ app.autodiscover_tasks()
 
 # Celery Beat Schedule
 app.conf.beat_schedule = {
+    'update-fee-statuses-nightly': {
+        'task': 'results.tasks.update_fee_statuses',
+        'schedule': crontab(hour=0, minute=30),  # Every day at 12:30 AM, before reminders and alerts
+    },
     'send-fee-reminders-daily': {
         'task': 'results.tasks.send_fee_reminders',
         'schedule': crontab(hour=9, minute=0),  # Every day at 9 AM
@@ -18,4 +22,12 @@ app.conf.beat_schedule = {
         'task': 'results.tasks.send_overdue_fee_alerts',
         'schedule': crontab(hour=10, minute=0, day_of_week='monday'),  # Every Monday at 10 AM
     },
+    'send-result-digests': {
+        'task': 'results.tasks.send_result_digests',
+        'schedule': crontab(minute='*/5'),  # Every 5 minutes
+    },
+    'send-absence-streak-alerts': {
+        'task': 'results.tasks.send_absence_streak_alerts',
+        'schedule': crontab(hour=6, minute=0),  # Every day at 6 AM, covering every school day up to yesterday
+    },
 }
\ No newline at end of file
@@ -0,0 +1,64 @@
+import hashlib
+from functools import wraps
+from django.db.models import Count, Max, QuerySet, Sum
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+
+def compute_etag(request, validators):
+    """
+    Hash what a response is built from into an ETag: querysets are reduced to
+    their latest updated_at, row count and the max and sum of their ids, so
+    a row leaving the set (deleted, expired) is caught even when another
+    one enters it at the same time. Other values are taken as they are. The user and full path are included
+    because the same data is scoped and paginated differently per request.
+    """
+    parts = [request.user.pk, request.get_full_path()]
+    for validator in validators:
+        if isinstance(validator, QuerySet):
+            freshness = validator.order_by().aggregate(
+                latest=Max('updated_at'),
+                count=Count('pk'),
+                last_id=Max('pk'),
+                id_sum=Sum('pk'),
+            )
+            parts += [
+                freshness['count'],
+                freshness['last_id'],
+                freshness['id_sum'],
+                freshness['latest'] and freshness['latest'].isoformat(),
+            ]
+        else:
+            parts.append(validator)
+    
+    return quote_etag(hashlib.sha1(':'.join(map(str, parts)).encode()).hexdigest())
+
+
+def conditional_get(get):
+    """
+    Decorate a view's get() to answer If-None-Match with a 304 before the
+    full response is queried and serialized. The view provides
+    get_validators(request, *args, **kwargs), returning the querysets and
+    values its response depends on, or None when the request should be
+    handled normally (e.g. the object is not visible to the user).
+    """
+    @wraps(get)
+    def wrapper(self, request, *args, **kwargs):
+        validators = self.get_validators(request, *args, **kwargs)
+        if validators is None:
+            return get(self, request, *args, **kwargs)
+        
+        etag = compute_etag(request, validators)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified['ETag'] = etag
+            return not_modified
+        
+        response = get(self, request, *args, **kwargs)
+        if response.status_code == 200:
+            response['ETag'] = etag
+            # Per user data: clients may keep it but must revalidate
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+    
+    return wrapper
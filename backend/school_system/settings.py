@@ -179,4 +179,40 @@ CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default='redis://localho
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
-CELERY_TIMEZONE = TIME_ZONE
\ No newline at end of file
+CELERY_TIMEZONE = TIME_ZONE
+
+# Cache
+# Shared by every web and Celery worker process, so clearing a cached rank,
+# grading scale, statistic or calendar after a write reaches all of them
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': config('CACHE_URL', default='redis://localhost:6379/1'),
+        # Seconds before a cached value is recomputed even if nothing cleared it
+        'TIMEOUT': config('CACHE_TIMEOUT', default=86400, cast=int),
+    }
+}
+
+# Report Cards
+# Worker processes used to render batch report cards (1 renders in-process)
+REPORT_CARD_WORKERS = config('REPORT_CARD_WORKERS', default=4, cast=int)
+
+# Result Imports
+# Rows upserted per transaction when importing results spreadsheets
+RESULT_IMPORT_BATCH_SIZE = config('RESULT_IMPORT_BATCH_SIZE', default=1000, cast=int)
+
+# Result Statistics
+# Minimum percentage counted as a pass in term statistics
+RESULT_PASS_PERCENTAGE = config('RESULT_PASS_PERCENTAGE', default=40, cast=int)
+
+# Result Notifications
+# Minutes to collect newly posted results into one email per parent (0 emails each result immediately)
+RESULT_DIGEST_WINDOW_MINUTES = config('RESULT_DIGEST_WINDOW_MINUTES', default=30, cast=int)
+
+# Period Attendance
+# Teaching periods in a school day (at most 12)
+PERIODS_PER_DAY = config('PERIODS_PER_DAY', default=8, cast=int)
+
+# Attendance Alerts
+# Parents are alerted when their child is absent this many school days in a row
+ABSENCE_STREAK_DAYS = config('ABSENCE_STREAK_DAYS', default=3, cast=int)
\ No newline at end of file
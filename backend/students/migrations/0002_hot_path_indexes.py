@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    
+    dependencies = [
+        ('classes', '0001_initial'),
+        ('students', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+    
+    operations = [
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['parent'], name='student_parent_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['last_name', 'first_name'], name='student_active_name_idx'),
+        ),
+    ]
@@ -61,6 +61,12 @@ class Student(models.Model):
     
     class Meta:
         ordering = ['last_name', 'first_name']
+        indexes = [
+            # A parent's active children
+            models.Index(fields=['parent'], name='student_parent_active_idx', condition=models.Q(is_active=True)),
+            # Active student lists in name order
+            models.Index(fields=['last_name', 'first_name'], name='student_active_name_idx', condition=models.Q(is_active=True)),
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.student_id})"